@@ -1,5 +1,15 @@
 from django.contrib import admin
-from .models import Class, Subject, Teacher, Student, Admin, StudentAttendance, TeacherAttendance, Fees, Salary
+from .models import Class, Subject, Teacher, Student, Admin, StudentAttendance, TeacherAttendance, Fees, Salary, AttendanceMonthlySummary, LoginIdentity
+from .search import search_queryset
+
+
+class FullTextSearchMixin:
+    """Changelist search through the FTS index (core.search) instead of icontains scans"""
+
+    def get_search_results(self, request, queryset, search_term):
+        if not search_term.strip():
+            return queryset, False
+        return search_queryset(queryset, search_term), False
 
 
 @admin.register(Class)
@@ -16,14 +26,14 @@ class SubjectAdmin(admin.ModelAdmin):
 
 
 @admin.register(Teacher)
-class TeacherAdmin(admin.ModelAdmin):
+class TeacherAdmin(FullTextSearchMixin, admin.ModelAdmin):
     list_display = ['employee_id', 'name', 'surname', 'email', 'mobile', 'joining_date']
     search_fields = ['name', 'surname', 'employee_id', 'email']
     list_filter = ['gender', 'joining_date']
 
 
 @admin.register(Student)
-class StudentAdmin(admin.ModelAdmin):
+class StudentAdmin(FullTextSearchMixin, admin.ModelAdmin):
     list_display = ['admission_no', 'name', 'surname', 'roll_no', 'student_class', 'section']
     search_fields = ['name', 'surname', 'admission_no', 'roll_no']
     list_filter = ['student_class', 'section', 'gender']
@@ -61,3 +71,17 @@ class SalaryAdmin(admin.ModelAdmin):
     list_display = ['teacher', 'month', 'amount', 'status', 'paid_date']
     search_fields = ['teacher__name', 'teacher__surname']
     list_filter = ['status', 'month']
+
+
+@admin.register(AttendanceMonthlySummary)
+class AttendanceMonthlySummaryAdmin(admin.ModelAdmin):
+    list_display = ['student', 'teacher', 'month', 'present', 'absent', 'late']
+    list_filter = ['month']
+
+
+@admin.register(LoginIdentity)
+class LoginIdentityAdmin(admin.ModelAdmin):
+    list_display = ['username', 'role', 'object_id', 'full_name']
+    search_fields = ['username', 'full_name']
+    list_filter = ['role']
+    readonly_fields = ['username', 'role', 'object_id', 'password', 'full_name']
@@ -0,0 +1,220 @@
+"""
+Bulk attendance writer shared by the attendance marking views.
+
+A whole roster for one date is validated with a single query and written
+with a single upsert on the (person, date) unique key, instead of one
+update_or_create round trip per row. The AttendanceMonthlySummary rollup
+is kept in step from the same write, and the dashboards of everyone marked
+are invalidated.
+"""
+from collections import namedtuple
+from datetime import date
+
+from django.db import transaction
+from django.db.models import Case, Count, F, Q, Value, When
+from django.db.models.functions import TruncMonth
+
+from .dashboards import invalidate_dashboard, invalidate_dashboards
+from .models import (
+    Student, Teacher, StudentAttendance, TeacherAttendance, AttendanceMonthlySummary
+)
+
+
+MarkResult = namedtuple('MarkResult', ['inserted', 'updated', 'skipped'])
+
+VALID_STATUSES = frozenset(choice for choice, _ in StudentAttendance.STATUS_CHOICES)
+
+
+def collect_statuses(data):
+    """Collect {pk: status} from the status_<pk> keys of a POST"""
+    statuses = {}
+    for key, value in data.items():
+        if key.startswith('status_'):
+            statuses[key[len('status_'):]] = value
+    return statuses
+
+
+def _clean_statuses(statuses):
+    """Drop rows with a non-numeric id or an unknown status"""
+    cleaned = {}
+    for pk, status in statuses.items():
+        pk = str(pk)
+        if pk.isdigit() and status in VALID_STATUSES:
+            cleaned[int(pk)] = status
+    return cleaned
+
+
+def month_bounds(day):
+    """Half-open [first day, first day of next month) range around a date"""
+    if isinstance(day, str):
+        day = date.fromisoformat(day)
+    start = day.replace(day=1)
+    if start.month == 12:
+        return start, date(start.year + 1, 1, 1)
+    return start, date(start.year, start.month + 1, 1)
+
+
+ATTENDANCE_MODELS = {
+    'student': StudentAttendance,
+    'teacher': TeacherAttendance,
+}
+
+
+def _status_counts():
+    return {
+        status: Count('pk', filter=Q(status=status))
+        for status in sorted(VALID_STATUSES)
+    }
+
+
+def _apply_summary_deltas(person_field, month, transitions):
+    """
+    Shift the monthly counters for ``transitions`` ({pk: (old, new)}).
+
+    Missing summary rows are created first, then every counter is moved in
+    one UPDATE using a CASE per status column.
+    """
+    person_column = f'{person_field}_id'
+    changed = {pk: (old, new) for pk, (old, new) in transitions.items() if old != new}
+    if not changed:
+        return
+
+    AttendanceMonthlySummary.objects.bulk_create(
+        [AttendanceMonthlySummary(month=month, **{person_column: pk}) for pk in changed],
+        ignore_conflicts=True,
+    )
+
+    deltas = {}
+    for status in VALID_STATUSES:
+        whens = []
+        plus = [pk for pk, (old, new) in changed.items() if new == status]
+        minus = [pk for pk, (old, new) in changed.items() if old == status]
+        if plus:
+            whens.append(When(**{f'{person_column}__in': plus}, then=Value(1)))
+        if minus:
+            whens.append(When(**{f'{person_column}__in': minus}, then=Value(-1)))
+        if whens:
+            deltas[status] = F(status) + Case(*whens, default=Value(0))
+
+    AttendanceMonthlySummary.objects.filter(
+        month=month, **{f'{person_column}__in': list(changed)}
+    ).update(**deltas)
+
+
+def refresh_monthly_summary(person_field, person_id, day, create=True):
+    """
+    Recount one person's month from the raw attendance rows.
+
+    Used for single-row saves and deletes that bypass the bulk writer.
+    With ``create=False`` only an existing summary row is updated, which
+    is safe to call while the person is being cascade-deleted.
+    """
+    start, end = month_bounds(day)
+    counts = ATTENDANCE_MODELS[person_field].objects.filter(
+        date__gte=start, date__lt=end, **{f'{person_field}_id': person_id}
+    ).aggregate(**_status_counts())
+    lookup = {f'{person_field}_id': person_id, 'month': start}
+    if create:
+        AttendanceMonthlySummary.objects.update_or_create(defaults=counts, **lookup)
+    else:
+        AttendanceMonthlySummary.objects.filter(**lookup).update(**counts)
+
+
+def rebuild_monthly_summaries(person_field, month=None, batch_size=1000):
+    """
+    Rebuild the rollup for all students or all teachers from scratch.
+
+    Restricted to one month when ``month`` (any date inside it) is given.
+    Returns the number of summary rows written.
+    """
+    person_column = f'{person_field}_id'
+    attendances = ATTENDANCE_MODELS[person_field].objects.all()
+    summaries = AttendanceMonthlySummary.objects.filter(**{f'{person_column}__isnull': False})
+    if month is not None:
+        start, end = month_bounds(month)
+        attendances = attendances.filter(date__gte=start, date__lt=end)
+        summaries = summaries.filter(month=start)
+
+    rows = (
+        attendances.order_by()
+        .annotate(month=TruncMonth('date'))
+        .values(person_column, 'month')
+        .annotate(**_status_counts())
+    )
+
+    written = 0
+    with transaction.atomic():
+        summaries.delete()
+        batch = []
+        for row in rows.iterator(chunk_size=batch_size):
+            batch.append(AttendanceMonthlySummary(**row))
+            if len(batch) >= batch_size:
+                AttendanceMonthlySummary.objects.bulk_create(batch)
+                written += len(batch)
+                batch = []
+        if batch:
+            AttendanceMonthlySummary.objects.bulk_create(batch)
+            written += len(batch)
+        invalidate_dashboards()
+    return written
+
+
+def _upsert(model, person_field, attendance_date, rows, extra):
+    """Insert or update one attendance row per person for the given date"""
+    person_column = f'{person_field}_id'
+    existing = dict(
+        model.objects.filter(date=attendance_date, **{f'{person_column}__in': rows})
+        .values_list(person_column, 'status')
+    )
+    objs = [
+        model(date=attendance_date, status=status, **{person_column: pk}, **extra)
+        for pk, status in rows.items()
+    ]
+    if objs:
+        model.objects.bulk_create(
+            objs,
+            update_conflicts=True,
+            unique_fields=[person_field, 'date'],
+            update_fields=['status', *extra],
+        )
+        _apply_summary_deltas(
+            person_field,
+            attendance_date.replace(day=1),
+            {pk: (existing.get(pk), status) for pk, status in rows.items()},
+        )
+        invalidate_dashboard(person_field, *rows)
+    return len(rows) - len(existing), len(existing)
+
+
+def mark_student_attendance(attendance_date, statuses, marked_by=None, class_id=None):
+    """
+    Write the attendance of a class (or the whole school) for one date.
+
+    ``statuses`` maps student ids to a status. Ids that do not belong to a
+    student, or to ``class_id`` when given, are skipped. ``marked_by`` is
+    only written when provided so admin marking keeps the existing teacher.
+    """
+    cleaned = _clean_statuses(statuses)
+    students = Student.objects.filter(pk__in=cleaned)
+    if class_id:
+        students = students.filter(student_class_id=class_id)
+
+    with transaction.atomic():
+        valid_ids = set(students.values_list('pk', flat=True))
+        rows = {pk: status for pk, status in cleaned.items() if pk in valid_ids}
+        extra = {'marked_by': marked_by} if marked_by is not None else {}
+        inserted, updated = _upsert(StudentAttendance, 'student', attendance_date, rows, extra)
+
+    return MarkResult(inserted, updated, len(statuses) - len(rows))
+
+
+def mark_teacher_attendance(attendance_date, statuses):
+    """Write the attendance of all teachers for one date"""
+    cleaned = _clean_statuses(statuses)
+
+    with transaction.atomic():
+        valid_ids = set(Teacher.objects.filter(pk__in=cleaned).values_list('pk', flat=True))
+        rows = {pk: status for pk, status in cleaned.items() if pk in valid_ids}
+        inserted, updated = _upsert(TeacherAttendance, 'teacher', attendance_date, rows, {})
+
+    return MarkResult(inserted, updated, len(statuses) - len(rows))
@@ -0,0 +1,165 @@
+"""
+Role-based access decorators for the core views.
+
+All three decorators share one fast path: a session already holding the
+required role goes straight to the view. Admin-panel requests without an
+admin session are signed in as the default admin, whose identity is
+resolved once and kept in the cache instead of querying Admin on every
+request, and the session is only written when its values change.
+
+Login reads one LoginIdentity row, kept in step with Admin, Teacher and
+Student by the signal handlers in core.signals. Unknown usernames can be
+remembered in a small per-process negative cache
+(LOGIN_NEGATIVE_CACHE_TTL) so repeated guesses skip the database.
+"""
+import time
+from collections import OrderedDict
+from functools import wraps
+
+from django.conf import settings
+from django.contrib import messages
+from django.core.cache import cache
+from django.db import transaction
+from django.shortcuts import redirect
+
+from .models import Admin, LoginIdentity, LOGIN_MODELS
+
+
+DEFAULT_ADMIN_CACHE_KEY = 'auth:default-admin'
+
+
+def resolve_default_admin():
+    """(id, full name) of the admin used for direct admin-panel access, or None"""
+    identity = cache.get(DEFAULT_ADMIN_CACHE_KEY)
+    if identity is None:
+        admin = Admin.objects.only('name', 'surname').order_by('pk').first()
+        if admin is None:
+            return None
+        identity = (admin.pk, admin.full_name)
+        cache.set(DEFAULT_ADMIN_CACHE_KEY, identity, getattr(settings, 'AUTH_IDENTITY_CACHE_TTL', 3600))
+    return identity
+
+
+def forget_default_admin():
+    cache.delete(DEFAULT_ADMIN_CACHE_KEY)
+
+
+def login_session(request, user_id, role, name):
+    """Store the signed-in principal, writing the session only if it changed"""
+    session = request.session
+    for key, value in (('user_id', user_id), ('user_role', role), ('user_name', name)):
+        if session.get(key) != value:
+            session[key] = value
+
+
+# ==================== LOGIN IDENTITIES ====================
+
+def login_identity(account):
+    return LoginIdentity(
+        username=account.username,
+        role=account.LOGIN_ROLE,
+        object_id=account.pk,
+        password=account.password,
+        full_name=account.full_name,
+    )
+
+
+def sync_login_identities(accounts):
+    """Insert or update the identities of saved Admin/Teacher/Student rows"""
+    identities = [login_identity(account) for account in accounts]
+    LoginIdentity.objects.bulk_create(
+        identities,
+        batch_size=500,
+        update_conflicts=True,
+        unique_fields=['role', 'object_id'],
+        update_fields=['username', 'password', 'full_name'],
+    )
+    for identity in identities:
+        _unknown_logins.pop((identity.role, identity.username), None)
+
+
+def rebuild_login_identities(role, batch_size=1000):
+    """Replace every identity for ``role`` from its accounts; returns the count"""
+    accounts = LOGIN_MODELS[role].objects.only('username', 'password', 'name', 'surname').order_by('pk')
+    with transaction.atomic():
+        LoginIdentity.objects.filter(role=role).delete()
+        created = len(LoginIdentity.objects.bulk_create(
+            (login_identity(account) for account in accounts.iterator(chunk_size=batch_size)),
+            batch_size=batch_size,
+        ))
+    _unknown_logins.clear()
+    return created
+
+
+def remove_login_identity(account):
+    LoginIdentity.objects.filter(role=account.LOGIN_ROLE, object_id=account.pk).delete()
+
+
+_unknown_logins = OrderedDict()
+
+
+def _negative_ttl():
+    return getattr(settings, 'LOGIN_NEGATIVE_CACHE_TTL', 0)
+
+
+def find_login_identity(role, username):
+    """The LoginIdentity for a login attempt, or None for an unknown username"""
+    key = (role, username)
+    ttl = _negative_ttl()
+    if ttl:
+        expires = _unknown_logins.get(key)
+        if expires is not None:
+            if expires > time.monotonic():
+                return None
+            del _unknown_logins[key]
+
+    identity = LoginIdentity.objects.filter(role=role, username=username).first()
+    if identity is None and ttl:
+        _unknown_logins[key] = time.monotonic() + ttl
+        if len(_unknown_logins) > getattr(settings, 'LOGIN_NEGATIVE_CACHE_SIZE', 10000):
+            _unknown_logins.popitem(last=False)
+    return identity
+
+
+# ==================== DECORATORS ====================
+
+def _admin_fallback(request):
+    """Sign the request in as the default admin, or redirect to login"""
+    identity = resolve_default_admin()
+    if identity is None:
+        messages.error(request, 'Admin not found.')
+        return redirect('login')
+    login_session(request, identity[0], 'admin', identity[1])
+    return None
+
+
+def _login_fallback(role):
+    def fallback(request):
+        messages.error(request, f'You must be logged in as {role} to access this page.')
+        return redirect('login')
+    return fallback
+
+
+def role_required(role, fallback):
+    """
+    Let the request through when the session holds ``role``.
+
+    Otherwise ``fallback(request)`` runs; it returns a response to stop
+    the request, or None once it has signed the request in.
+    """
+    def decorator(view_func):
+        @wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            if request.session.get('user_role') != role:
+                response = fallback(request)
+                if response is not None:
+                    return response
+            return view_func(request, *args, **kwargs)
+        return wrapper
+    return decorator
+
+
+# Auto-login as admin for direct access
+admin_required = role_required('admin', _admin_fallback)
+teacher_required = role_required('teacher', _login_fallback('teacher'))
+student_required = role_required('student', _login_fallback('student'))
@@ -0,0 +1,77 @@
+"""
+Autocomplete choices for foreign keys to large tables.
+
+AutocompleteSelect renders only the empty choice and the selected object
+instead of one <option> per row; static/js/main.js fetches the rest a
+page at a time from the autocomplete view as the user types or scrolls.
+The form field is still a ModelChoiceField, so validation looks up just
+the submitted primary key.
+
+Without a query a page is the next PAGE_SIZE rows after the ``cursor``
+primary key. Students and teachers with a query are ranked by the
+full-text index (core.search) and ``cursor`` is an offset into that
+ranking; classes are few and are filtered with icontains.
+"""
+from django import forms
+from django.db.models import Q
+from django.urls import reverse
+
+from .models import Class, Student, Teacher
+from .search import search
+
+
+PAGE_SIZE = 20
+
+# kind: (queryset, fields matched by icontains when there is no full-text index)
+SOURCES = {
+    'students': (Student.objects.only('name', 'surname', 'admission_no'), None),
+    'teachers': (Teacher.objects.only('name', 'surname', 'employee_id'), None),
+    'classes': (Class.objects.only('name', 'section'), ('name', 'section')),
+}
+
+
+def autocomplete_page(kind, query='', cursor=0):
+    """One page of (pk, label) choices and the cursor of the next page, or None"""
+    queryset, fields = SOURCES[kind]
+    ranked = bool(query) and fields is None
+    if ranked:
+        objects = search(queryset, query, cursor + PAGE_SIZE + 1)[cursor:]
+    else:
+        for term in query.split():
+            queryset = queryset.filter(Q(*[Q(**{f'{field}__icontains': term}) for field in fields], _connector=Q.OR))
+        objects = list(queryset.filter(pk__gt=cursor).order_by('pk')[:PAGE_SIZE + 1])
+
+    page = [(obj.pk, str(obj)) for obj in objects[:PAGE_SIZE]]
+    if len(objects) <= PAGE_SIZE:
+        return page, None
+    return page, cursor + PAGE_SIZE if ranked else page[-1][0]
+
+
+class AutocompleteSelect(forms.Select):
+    """Select for a ModelChoiceField whose options are loaded by static/js/main.js"""
+
+    def __init__(self, kind, attrs=None):
+        super().__init__(attrs)
+        self.kind = kind
+
+    def build_attrs(self, base_attrs, extra_attrs=None):
+        attrs = super().build_attrs(base_attrs, extra_attrs)
+        attrs['data-autocomplete'] = reverse('autocomplete', args=[self.kind])
+        return attrs
+
+    def optgroups(self, name, value, attrs=None):
+        choices = self.choices
+        self.choices = self.selected_choices(value)
+        try:
+            return super().optgroups(name, value, attrs)
+        finally:
+            self.choices = choices
+
+    def selected_choices(self, value):
+        """The empty choice and the selected objects, fetched by primary key"""
+        iterator = self.choices
+        pks = [pk for pk in value if str(pk).isdigit()]
+        choices = [('', iterator.field.empty_label)] if iterator.field.empty_label is not None else []
+        if pks:
+            choices += [iterator.choice(obj) for obj in iterator.queryset.filter(pk__in=pks)]
+        return choices
@@ -0,0 +1,114 @@
+"""
+Cached counters for the admin dashboard.
+
+Totals and the recent-5 lists live in Django's cache framework. Signal
+handlers in core.signals move the totals and drop the recent lists as
+rows are saved and deleted; DASHBOARD_CACHE_TTL bounds any drift from
+writes that bypass signals (bulk_create, raw SQL, another worker's
+local-memory cache). Use the file-based backend when running several
+workers so they share one copy.
+"""
+from functools import partial
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from .models import Student, Teacher, Class, Subject
+
+
+KEY_PREFIX = 'dashboard:'
+
+COUNTERS = {
+    'total_students': Student,
+    'total_teachers': Teacher,
+    'total_classes': Class,
+    'total_subjects': Subject,
+}
+
+
+def _recent_students():
+    return [
+        {
+            'pk': student.pk,
+            'name': student.name,
+            'surname': student.surname,
+            'roll_no': student.roll_no,
+            'student_class': str(student.student_class) if student.student_class else None,
+        }
+        for student in Student.objects.select_related('student_class').order_by('-created_at')[:5]
+    ]
+
+
+def _recent_teachers():
+    return [
+        {
+            'pk': teacher.pk,
+            'name': teacher.name,
+            'surname': teacher.surname,
+            'employee_id': teacher.employee_id,
+            'qualification': teacher.qualification,
+        }
+        for teacher in Teacher.objects.order_by('-created_at')[:5]
+    ]
+
+
+RECENT_LISTS = {
+    'recent_students': _recent_students,
+    'recent_teachers': _recent_teachers,
+}
+
+
+def _ttl():
+    return getattr(settings, 'DASHBOARD_CACHE_TTL', 300)
+
+
+def _names():
+    return list(COUNTERS) + list(RECENT_LISTS)
+
+
+def get_dashboard_counters():
+    """Totals and recent lists for the admin dashboard, computing only cache misses"""
+    cached = cache.get_many([KEY_PREFIX + name for name in _names()])
+    values = {name: cached.get(KEY_PREFIX + name) for name in _names()}
+
+    missing = {}
+    for name, model in COUNTERS.items():
+        if values[name] is None:
+            missing[name] = model.objects.count()
+    for name, loader in RECENT_LISTS.items():
+        if values[name] is None:
+            missing[name] = loader()
+
+    if missing:
+        cache.set_many({KEY_PREFIX + name: value for name, value in missing.items()}, _ttl())
+        values.update(missing)
+    return values
+
+
+
+def _adjust(name, delta):
+    try:
+        cache.incr(KEY_PREFIX + name, delta)
+    except ValueError:
+        # Not cached yet; the next dashboard view counts from the database
+        pass
+
+
+def adjust_counter(model, delta):
+    """Move the total for ``model`` once the surrounding transaction commits"""
+    for name, counted in COUNTERS.items():
+        if counted is model:
+            transaction.on_commit(partial(_adjust, name, delta))
+
+
+def invalidate_recent(*names):
+    """Drop cached recent lists once the surrounding transaction commits"""
+    keys = [KEY_PREFIX + name for name in names]
+    transaction.on_commit(partial(cache.delete_many, keys))
+
+
+def invalidate_dashboard_counters():
+    """Forget everything, e.g. after bulk_create or raw SQL bypassed signals"""
+    keys = [KEY_PREFIX + name for name in _names()]
+    transaction.on_commit(partial(cache.delete_many, keys))
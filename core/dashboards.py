@@ -0,0 +1,143 @@
+"""
+Page and fragment caching for the student and teacher dashboards.
+
+Every (role, user) has a data version in the cache: a nanosecond
+timestamp bumped by the signal handlers in core.signals and by the bulk
+attendance writer whenever that user's attendance, fees or profile
+change, plus one global version for writers that touch everybody. The
+versions and today's date (the pages show this month) key three layers:
+
+* ETag / Last-Modified, so a browser revalidating an unchanged page gets
+  a 304 before any query or render;
+* the whole rendered page, reused while no flash message is pending;
+* the template fragments around the messages block, so a page that has
+  to show a message is still rendered without querying the database.
+
+Like the other caches here, use a cache every worker shares (e.g.
+CACHE_BACKEND=file). A worker with its own local-memory cache never
+sees bumps made by other workers, so the versions expire after
+DASHBOARD_PAGE_CACHE_TTL like the pages: a version that has expired
+restarts from the current time, so that worker's ETags, stored pages
+and fragments are replaced. This bounds how long such a worker can
+answer 304 or serve an old page.
+"""
+import time
+from datetime import date, datetime
+from functools import partial
+from hashlib import md5
+
+from django.conf import settings
+from django.contrib.messages import get_messages
+from django.core.cache import cache
+from django.db import transaction
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag
+
+
+KEY_PREFIX = 'dashboard-page:'
+
+# Version name bumped for every dashboard at once
+ALL_USERS = '*'
+
+
+def _ttl():
+    return getattr(settings, 'DASHBOARD_PAGE_CACHE_TTL', 3600)
+
+
+def _version_key(name):
+    return f'{KEY_PREFIX}v:{name}'
+
+
+def _bump(*names):
+    # Clock-based so the version doubles as the Last-Modified time
+    version = time.time_ns()
+    cache.set_many({_version_key(name): version for name in names}, _ttl())
+
+
+def invalidate_dashboard(role, *user_ids):
+    """Drop the cached dashboards of these users once the transaction commits"""
+    names = [f'{role}:{user_id}' for user_id in user_ids]
+    if names:
+        transaction.on_commit(partial(_bump, *names))
+
+
+def invalidate_dashboards():
+    """Drop every cached dashboard, e.g. after a rebuild that bypassed signals"""
+    transaction.on_commit(partial(_bump, ALL_USERS))
+
+
+def _version_keys(role, user_id):
+    return [_version_key(ALL_USERS), _version_key(f'{role}:{user_id}')]
+
+
+def _missing_versions(keys, stamps):
+    # Nothing recorded since the cache was cleared or the version expired: start the clock now
+    return {key: time.time_ns() for key in keys if key not in stamps}
+
+
+def _version_and_last_modified(keys, stamps):
+    """(version string, Last-Modified timestamp) from the version stamps"""
+    today = date.today()
+    midnight = datetime.combine(today, datetime.min.time()).timestamp()
+    last_modified = int(max(max(stamps.values()) / 1e9, midnight))
+    return '.'.join([*(str(stamps[key]) for key in keys), today.isoformat()]), last_modified
+
+
+def _version(role, user_id):
+    """(version string, Last-Modified timestamp) of one user's dashboard"""
+    keys = _version_keys(role, user_id)
+    stamps = cache.get_many(keys)
+    missing = _missing_versions(keys, stamps)
+    if missing:
+        cache.set_many(missing, _ttl())
+        stamps.update(missing)
+    return _version_and_last_modified(keys, stamps)
+
+
+def fragment_context(user_id, version):
+    """Context the dashboard template keys its {% cache %} fragments on"""
+    return {'dashboard_user': user_id, 'dashboard_version': version, 'dashboard_cache_ttl': _ttl()}
+
+
+def _etag(role, user_id, version, user_name):
+    return quote_etag(md5(f'{role}:{user_id}:{version}:{user_name}'.encode()).hexdigest())
+
+
+def _finish(response, etag=None, last_modified=None):
+    if etag:
+        response['ETag'] = etag
+        response['Last-Modified'] = http_date(last_modified)
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
+
+
+def cached_dashboard(request, role, user_id, render_page):
+    """
+    Answer a dashboard request from the cache layers, rendering on a miss.
+
+    ``render_page(context)`` builds the response; ``context`` holds the
+    fragment keys the template needs. The view's data must be lazy
+    (querysets, SimpleLazyObject, callables) rather than left out when the
+    fragments look cached: a fragment that expires before it is rendered
+    still fetches its data instead of caching an empty block.
+    """
+    version, last_modified = _version(role, user_id)
+    context = fragment_context(user_id, version)
+
+    if len(get_messages(request)):
+        # A message is shown once: neither a 304 nor a stored page would show it
+        return _finish(render_page(context))
+
+    etag = _etag(role, user_id, version, request.session.get('user_name', ''))
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if response is None:
+        key = f'{KEY_PREFIX}{role}:{user_id}:{etag}'
+        page = cache.get(key)
+        if page is None:
+            response = render_page(context)
+            if response.status_code == 200:
+                cache.set(key, (response.content, response['Content-Type']), _ttl())
+        else:
+            response = HttpResponse(page[0], content_type=page[1])
+    return _finish(response, etag, last_modified)
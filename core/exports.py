@@ -0,0 +1,153 @@
+"""
+Streaming CSV/JSONL exports for students, attendance, fees and salary.
+
+Rows are read with ``values_list().iterator(chunk_size=...)`` and encoded
+into byte chunks as they are produced, optionally gzip-compressed on the
+fly, so memory stays flat however many rows are exported. Used by the
+admin export endpoint and ``manage.py export``.
+"""
+import csv
+import io
+import zlib
+from collections import namedtuple
+from datetime import date
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+from .models import Student, StudentAttendance, TeacherAttendance, Fees, Salary
+
+
+ExportSpec = namedtuple('ExportSpec', ['model', 'fields', 'date_field', 'class_field'])
+
+EXPORTS = {
+    'students': ExportSpec(
+        Student,
+        ['id', 'admission_no', 'username', 'name', 'surname', 'email', 'mobile', 'gender', 'dob',
+         'roll_no', 'student_class_id', 'section', 'admission_date', 'parent_name', 'parent_mobile',
+         'parent_email'],
+        'admission_date',
+        'student_class_id',
+    ),
+    'student-attendance': ExportSpec(
+        StudentAttendance,
+        ['id', 'date', 'student_id', 'student__admission_no', 'student__name', 'student__surname',
+         'status', 'marked_by_id', 'remarks'],
+        'date',
+        'student__student_class_id',
+    ),
+    'teacher-attendance': ExportSpec(
+        TeacherAttendance,
+        ['id', 'date', 'teacher_id', 'teacher__employee_id', 'teacher__name', 'teacher__surname',
+         'status', 'remarks'],
+        'date',
+        None,
+    ),
+    'fees': ExportSpec(
+        Fees,
+        ['id', 'student_id', 'student__admission_no', 'fee_type', 'amount', 'due_date', 'paid_date',
+         'paid_amount', 'status', 'remarks'],
+        'due_date',
+        'student__student_class_id',
+    ),
+    'salary': ExportSpec(
+        Salary,
+        ['id', 'teacher_id', 'teacher__employee_id', 'month', 'amount', 'paid_date', 'status', 'remarks'],
+        'paid_date',
+        None,
+    ),
+}
+
+FORMATS = {
+    'csv': 'text/csv',
+    'jsonl': 'application/x-ndjson',
+}
+
+
+class ExportError(ValueError):
+    """Unknown export, format or filter value"""
+
+
+def parse_date(value):
+    if not value:
+        return None
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        raise ExportError(f'Invalid date: {value}')
+
+
+def export_queryset(kind, date_from=None, date_to=None, class_id=None):
+    """Rows for an export, filtered on its date column and class"""
+    if kind not in EXPORTS:
+        raise ExportError(f'Unknown export: {kind}')
+    spec = EXPORTS[kind]
+    queryset = spec.model.objects.order_by('pk')
+    if date_from:
+        queryset = queryset.filter(**{f'{spec.date_field}__gte': date_from})
+    if date_to:
+        queryset = queryset.filter(**{f'{spec.date_field}__lte': date_to})
+    if class_id:
+        if spec.class_field is None:
+            raise ExportError(f'{kind} cannot be filtered by class')
+        if not str(class_id).isdigit():
+            raise ExportError(f'Invalid class: {class_id}')
+        queryset = queryset.filter(**{spec.class_field: class_id})
+    return queryset.values_list(*spec.fields)
+
+
+def _encode_csv(fields, rows):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(fields)
+    yield buffer.getvalue()
+    for row in rows:
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerow(row)
+        yield buffer.getvalue()
+
+
+def _encode_jsonl(fields, rows):
+    encoder = DjangoJSONEncoder(separators=(',', ':'))
+    for row in rows:
+        yield encoder.encode(dict(zip(fields, row))) + '\n'
+
+
+def _chunked(lines, chunk_bytes):
+    """Join encoded lines into byte chunks of roughly chunk_bytes"""
+    parts, size = [], 0
+    for line in lines:
+        data = line.encode()
+        parts.append(data)
+        size += len(data)
+        if size >= chunk_bytes:
+            yield b''.join(parts)
+            parts, size = [], 0
+    if parts:
+        yield b''.join(parts)
+
+
+def _gzipped(chunks):
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)  # 31: gzip container
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def stream_export(kind, fmt='csv', date_from=None, date_to=None, class_id=None,
+                  compress=False, chunk_size=2000, chunk_bytes=64 * 1024):
+    """Generator of byte chunks for an export"""
+    if fmt not in FORMATS:
+        raise ExportError(f'Unknown format: {fmt}')
+    queryset = export_queryset(kind, date_from, date_to, class_id)
+    fields = EXPORTS[kind].fields
+    encode = _encode_csv if fmt == 'csv' else _encode_jsonl
+    chunks = _chunked(encode(fields, queryset.iterator(chunk_size=chunk_size)), chunk_bytes)
+    return _gzipped(chunks) if compress else chunks
+
+
+def export_filename(kind, fmt, compress=False):
+    name = f'{kind}-{date.today().isoformat()}.{fmt}'
+    return f'{name}.gz' if compress else name
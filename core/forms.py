@@ -1,5 +1,6 @@
 from django import forms
 from .models import Student, Teacher, Class, Subject, Fees, Salary, StudentAttendance, TeacherAttendance, Admin
+from .autocomplete import AutocompleteSelect
 
 
 class LoginForm(forms.Form):
@@ -46,7 +47,7 @@ class StudentForm(forms.ModelForm):
             'gender': forms.Select(attrs={'class': 'form-control'}),
             'roll_no': forms.TextInput(attrs={'class': 'form-control', 'placeholder': 'Roll Number'}),
             'address': forms.Textarea(attrs={'class': 'form-control', 'rows': 3, 'placeholder': 'Address'}),
-            'student_class': forms.Select(attrs={'class': 'form-control'}),
+            'student_class': AutocompleteSelect('classes', attrs={'class': 'form-control'}),
             'section': forms.TextInput(attrs={'class': 'form-control', 'placeholder': 'Section'}),
             'admission_no': forms.TextInput(attrs={'class': 'form-control', 'placeholder': 'Admission Number'}),
             'admission_date': forms.DateInput(attrs={'class': 'form-control', 'type': 'date'}),
@@ -133,7 +134,7 @@ class SubjectForm(forms.ModelForm):
         widgets = {
             'name': forms.TextInput(attrs={'class': 'form-control', 'placeholder': 'Subject Name'}),
             'code': forms.TextInput(attrs={'class': 'form-control', 'placeholder': 'Subject Code'}),
-            'class_assigned': forms.Select(attrs={'class': 'form-control'}),
+            'class_assigned': AutocompleteSelect('classes', attrs={'class': 'form-control'}),
         }
 
 
@@ -143,7 +144,7 @@ class FeesForm(forms.ModelForm):
         model = Fees
         fields = ['student', 'fee_type', 'amount', 'due_date', 'paid_date', 'paid_amount', 'status', 'remarks']
         widgets = {
-            'student': forms.Select(attrs={'class': 'form-control'}),
+            'student': AutocompleteSelect('students', attrs={'class': 'form-control'}),
             'fee_type': forms.TextInput(attrs={'class': 'form-control', 'placeholder': 'Fee Type'}),
             'amount': forms.NumberInput(attrs={'class': 'form-control', 'placeholder': 'Amount'}),
             'due_date': forms.DateInput(attrs={'class': 'form-control', 'type': 'date'}),
@@ -160,7 +161,7 @@ class SalaryForm(forms.ModelForm):
         model = Salary
         fields = ['teacher', 'month', 'amount', 'paid_date', 'status', 'remarks']
         widgets = {
-            'teacher': forms.Select(attrs={'class': 'form-control'}),
+            'teacher': AutocompleteSelect('teachers', attrs={'class': 'form-control'}),
             'month': forms.TextInput(attrs={'class': 'form-control', 'placeholder': 'Month (e.g., January 2024)'}),
             'amount': forms.NumberInput(attrs={'class': 'form-control', 'placeholder': 'Amount'}),
             'paid_date': forms.DateInput(attrs={'class': 'form-control', 'type': 'date'}),
@@ -193,3 +194,18 @@ class TeacherAttendanceForm(forms.ModelForm):
             'status': forms.Select(attrs={'class': 'form-control'}),
             'remarks': forms.Textarea(attrs={'class': 'form-control', 'rows': 2, 'placeholder': 'Remarks'}),
         }
+
+
+class BulkImportForm(forms.Form):
+    """Upload a CSV or JSONL file of students or teachers"""
+    KIND_CHOICES = [
+        ('students', 'Students'),
+        ('teachers', 'Teachers'),
+    ]
+
+    kind = forms.ChoiceField(choices=KIND_CHOICES, widget=forms.Select(attrs={'class': 'form-control'}))
+    file = forms.FileField(widget=forms.ClearableFileInput(attrs={
+        'class': 'form-control',
+        'accept': '.csv,.jsonl,.ndjson'
+    }))
+    dry_run = forms.BooleanField(required=False, label='Validate only')
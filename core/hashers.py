@@ -0,0 +1,103 @@
+"""
+Password hashing for Admin, Teacher and Student.
+
+PASSWORD_HASHERS (see settings) puts one of the configurable hashers below
+first; its cost comes from settings so it can be tuned per deployment
+without a code change. Hashes made with another algorithm or cost still
+verify and are upgraded on the next successful login by
+``rehash_password``. ``set_passwords_bulk`` spreads hashing for bulk
+creation over a process pool, one process per core.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.contrib.auth.hashers import (
+    Argon2PasswordHasher, PBKDF2PasswordHasher, ScryptPasswordHasher, make_password,
+)
+
+
+class ConfigurablePBKDF2PasswordHasher(PBKDF2PasswordHasher):
+    """PBKDF2-SHA256 with PASSWORD_PBKDF2_ITERATIONS iterations"""
+
+    @property
+    def iterations(self):
+        return getattr(settings, 'PASSWORD_PBKDF2_ITERATIONS', None) or PBKDF2PasswordHasher.iterations
+
+
+class ConfigurableArgon2PasswordHasher(Argon2PasswordHasher):
+    """Argon2id with PASSWORD_ARGON2_TIME_COST / _MEMORY_COST; needs argon2-cffi"""
+
+    @property
+    def time_cost(self):
+        return getattr(settings, 'PASSWORD_ARGON2_TIME_COST', None) or Argon2PasswordHasher.time_cost
+
+    @property
+    def memory_cost(self):
+        return getattr(settings, 'PASSWORD_ARGON2_MEMORY_COST', None) or Argon2PasswordHasher.memory_cost
+
+
+class ConfigurableScryptPasswordHasher(ScryptPasswordHasher):
+    """scrypt with PASSWORD_SCRYPT_WORK_FACTOR"""
+
+    @property
+    def work_factor(self):
+        return getattr(settings, 'PASSWORD_SCRYPT_WORK_FACTOR', None) or ScryptPasswordHasher.work_factor
+
+
+def rehash_password(instance, raw_password):
+    """check_password setter: store a hash made with the current hasher and cost"""
+    instance.set_password(raw_password)
+    type(instance)._default_manager.filter(pk=instance.pk).update(password=instance.password)
+
+
+def _init_hasher_process():
+    import django
+    django.setup()
+
+
+def hasher_workers(workers=None):
+    if workers is None:
+        return os.cpu_count() or 1
+    return workers
+
+
+@contextmanager
+def hasher_pool(workers=None):
+    """Process pool for hashing, or None when one worker is enough"""
+    workers = hasher_workers(workers)
+    if workers <= 1:
+        yield None
+        return
+    pool = ProcessPoolExecutor(workers, initializer=_init_hasher_process)
+    try:
+        yield pool
+    finally:
+        pool.shutdown()
+
+
+def hash_passwords(raw_passwords, pool=None, workers=1):
+    """Hash a list of raw passwords, spread over ``pool`` when given"""
+    if pool is None:
+        return [make_password(raw) for raw in raw_passwords]
+    chunksize = max(1, len(raw_passwords) // (4 * workers))
+    return list(pool.map(make_password, raw_passwords, chunksize=chunksize))
+
+
+def set_passwords_bulk(instances, raw_passwords, pool=None, workers=None):
+    """
+    set_password() for many unsaved instances at once.
+
+    Hashing runs in ``pool`` (from ``hasher_pool()``, reusable across
+    calls) when given, otherwise in a pool started for this call.
+    """
+    raw_passwords = list(raw_passwords)
+    workers = hasher_workers(workers)
+    if pool is None and workers > 1 and len(raw_passwords) > 1:
+        with hasher_pool(workers) as pool:
+            encoded = hash_passwords(raw_passwords, pool, workers)
+    else:
+        encoded = hash_passwords(raw_passwords, pool, workers)
+    for instance, password in zip(instances, encoded):
+        instance.password = password
@@ -0,0 +1,209 @@
+"""
+Bulk student/teacher import from CSV or JSONL.
+
+The existing values of every unique field are loaded once up front, rows
+are validated in chunks against those sets without per-row queries,
+passwords for a chunk are hashed in a process pool and valid rows are
+written with bulk_create. Invalid rows are skipped and reported by line.
+Used by ``manage.py bulk_import`` (one hashing process per CPU) and the
+admin upload page (BULK_IMPORT_WEB_WORKERS, one by default).
+"""
+import csv
+import json
+from collections import namedtuple
+
+from django.core.exceptions import ValidationError
+from django.db import transaction
+
+from .auth import sync_login_identities
+from .counters import invalidate_dashboard_counters
+from .hashers import hasher_pool, hasher_workers, set_passwords_bulk
+from .models import Class, Student, Teacher
+from .rosters import invalidate_rosters
+
+
+ImportSpec = namedtuple('ImportSpec', ['model', 'fields', 'unique_fields'])
+
+IMPORTS = {
+    'students': ImportSpec(
+        Student,
+        ['username', 'name', 'surname', 'email', 'mobile', 'dob', 'gender', 'roll_no', 'address',
+         'section', 'admission_no', 'admission_date', 'parent_name', 'parent_mobile', 'parent_email'],
+        ['username', 'email', 'admission_no'],
+    ),
+    'teachers': ImportSpec(
+        Teacher,
+        ['username', 'name', 'surname', 'email', 'mobile', 'dob', 'gender', 'address', 'employee_id',
+         'qualification', 'joining_date', 'experience', 'salary'],
+        ['username', 'email', 'employee_id'],
+    ),
+}
+
+FORMATS = ('csv', 'jsonl')
+
+RowError = namedtuple('RowError', ['line', 'messages'])
+ImportResult = namedtuple('ImportResult', ['created', 'errors'])
+
+
+class ImportFileError(ValueError):
+    """Unknown import kind or file format"""
+
+
+def detect_format(filename):
+    return 'jsonl' if filename.lower().endswith(('.jsonl', '.ndjson', '.json')) else 'csv'
+
+
+def read_rows(stream, fmt):
+    """Yield (line number, row dict or None when the line cannot be parsed)"""
+    if fmt == 'jsonl':
+        for line_no, line in enumerate(stream, 1):
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError:
+                row = None
+            yield line_no, row if isinstance(row, dict) else None
+    elif fmt == 'csv':
+        reader = csv.DictReader(stream)
+        for row in reader:
+            yield reader.line_num, row
+    else:
+        raise ImportFileError(f'Unknown format: {fmt}')
+
+
+class Importer:
+    """Validate and insert one file of students or teachers"""
+
+    def __init__(self, kind, chunk_size=1000, workers=None, dry_run=False):
+        if kind not in IMPORTS:
+            raise ImportFileError(f'Unknown import: {kind}')
+        self.kind = kind
+        self.spec = IMPORTS[kind]
+        self.chunk_size = chunk_size
+        self.workers = hasher_workers(workers)
+        self.dry_run = dry_run
+        self.choices = self.choice_maps()
+        self.created = 0
+        self.errors = []
+
+    def choice_maps(self):
+        """Lowercased value and label -> stored value, for fields with choices"""
+        maps = {}
+        for field in self.spec.fields:
+            choices = self.spec.model._meta.get_field(field).choices
+            if choices:
+                maps[field] = {}
+                for value, label in choices:
+                    maps[field][str(value).lower()] = value
+                    maps[field][str(label).lower()] = value
+        return maps
+
+    def load_existing(self):
+        """One query per unique field, plus the class lookup for students"""
+        self.taken = {
+            field: set(self.spec.model.objects.values_list(field, flat=True))
+            for field in self.spec.unique_fields
+        }
+        self.classes = {}
+        if self.spec.model is Student:
+            for cls in Class.objects.all():
+                self.classes[str(cls.pk)] = cls.pk
+                self.classes[str(cls).lower()] = cls.pk
+
+    def run(self, rows):
+        self.load_existing()
+        with hasher_pool(1 if self.dry_run else self.workers) as pool:
+            chunk = []
+            for line, row in rows:
+                chunk.append((line, row))
+                if len(chunk) >= self.chunk_size:
+                    self.process_chunk(chunk, pool)
+                    chunk = []
+            if chunk:
+                self.process_chunk(chunk, pool)
+        if self.created and not self.dry_run:
+            invalidate_dashboard_counters()
+            invalidate_rosters()
+        return ImportResult(self.created, self.errors)
+
+    def process_chunk(self, chunk, pool):
+        valid, passwords = [], []
+        for line, row in chunk:
+            if row is None:
+                self.errors.append(RowError(line, ['Row could not be parsed.']))
+                continue
+            instance, errors = self.build(row)
+            if errors:
+                self.errors.append(RowError(line, errors))
+                continue
+            valid.append(instance)
+            passwords.append(str(row['password']) if row.get('password') else None)
+
+        if not valid:
+            return
+        if self.dry_run:
+            self.created += len(valid)
+            return
+
+        set_passwords_bulk(valid, passwords, pool, self.workers)
+        with transaction.atomic():
+            self.spec.model.objects.bulk_create(valid, batch_size=500)
+            # bulk_create skips the post_save handler that keeps logins in sync
+            sync_login_identities(valid)
+        self.created += len(valid)
+
+    def build(self, row):
+        """Model instance for a row and a list of error messages"""
+        values = {}
+        for field in self.spec.fields:
+            value = row.get(field)
+            if value is not None and str(value).strip() != '':
+                value = str(value).strip()
+                if field in self.choices:
+                    value = self.choices[field].get(value.lower(), value)
+                values[field] = value
+        instance = self.spec.model(**values)
+
+        errors = []
+        if self.spec.model is Student:
+            class_ref = str(row.get('class') or row.get('student_class') or '').strip()
+            if class_ref:
+                class_id = self.classes.get(class_ref) or self.classes.get(class_ref.lower())
+                if class_id is None:
+                    errors.append(f'class: Unknown class "{class_ref}".')
+                instance.student_class_id = class_id
+
+        try:
+            instance.full_clean(
+                exclude=['password', 'student_class', 'subjects'],
+                validate_unique=False,
+                validate_constraints=False,
+            )
+        except ValidationError as e:
+            errors.extend(
+                f'{field}: {message}'
+                for field, messages in e.message_dict.items()
+                for message in messages
+            )
+
+        for field in self.spec.unique_fields:
+            value = getattr(instance, field)
+            if value and value in self.taken[field]:
+                errors.append(f'{field}: "{value}" already exists.')
+        if not errors:
+            for field in self.spec.unique_fields:
+                self.taken[field].add(getattr(instance, field))
+        return instance, errors
+
+
+def import_file(kind, stream, fmt, **options):
+    """Import an open text stream, returns an ImportResult"""
+    return Importer(kind, **options).run(read_rows(stream, fmt))
+
+
+def write_error_report(errors, stream):
+    writer = csv.writer(stream)
+    writer.writerow(['line', 'errors'])
+    for error in errors:
+        writer.writerow([error.line, '; '.join(error.messages)])
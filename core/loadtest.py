@@ -0,0 +1,153 @@
+"""
+Helpers shared by the load-test commands (bench_asgi, bench_throughput).
+
+They start the project under a real gunicorn server on a free local port,
+store a signed-in session for each role, and drive concurrent GET
+requests at it from a pool of client threads.
+"""
+import http.client
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from importlib import import_module
+
+from django.conf import settings
+from django.core.management.base import CommandError
+
+from .models import Admin, Teacher, Student
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round((len(ordered) - 1) * pct / 100)))]
+
+
+def _session_store(session_key=None):
+    return import_module(settings.SESSION_ENGINE).SessionStore(session_key)
+
+
+def create_role_sessions():
+    """A stored session for the first admin, teacher and student, keyed by role"""
+    accounts = {
+        'admin': Admin.objects.order_by('pk').first(),
+        'teacher': Teacher.objects.order_by('pk').first(),
+        'student': Student.objects.order_by('pk').first(),
+    }
+    if not all(accounts.values()):
+        raise CommandError('Need at least one admin, teacher and student: run create_admin and seed_school.')
+    sessions = {}
+    for role, account in accounts.items():
+        session = _session_store()
+        session.update({'user_id': account.pk, 'user_role': role, 'user_name': account.full_name})
+        session.save()
+        sessions[role] = session.session_key
+    return sessions
+
+
+def delete_role_sessions(sessions):
+    for session_key in sessions.values():
+        _session_store(session_key).delete()
+
+
+def request_host():
+    # The servers run with the project settings, so use a host they accept
+    for host in settings.ALLOWED_HOSTS:
+        return 'localhost' if host == '*' else host.lstrip('.')
+    return 'localhost'
+
+
+def start_gunicorn(args, port, label, env=None, preexec_fn=None):
+    """Start ``gunicorn <args>`` bound to ``port`` and wait until it accepts connections"""
+    command = [sys.executable, '-m', 'gunicorn', *args, '--bind', f'127.0.0.1:{port}', '--log-level', 'warning']
+    server = subprocess.Popen(command, cwd=settings.BASE_DIR, env=env or os.environ.copy(), preexec_fn=preexec_fn)
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise CommandError(f'{label} server exited with code {server.returncode}')
+        try:
+            socket.create_connection(('127.0.0.1', port), timeout=1).close()
+            return server
+        except OSError:
+            time.sleep(0.2)
+    server.terminate()
+    raise CommandError(f'{label} server did not start within 60s')
+
+
+def stop_gunicorn(server):
+    server.terminate()
+    server.wait(timeout=60)
+
+
+def fetch(port, host, path, session_key):
+    """GET ``path`` with the given session, returns the status code"""
+    conn = http.client.HTTPConnection('127.0.0.1', port, timeout=60)
+    try:
+        conn.request('GET', path, headers={
+            'Host': host,
+            'Cookie': f'{settings.SESSION_COOKIE_NAME}={session_key}',
+            # Skip the HTTPS redirect the production settings expect a proxy to make
+            'X-Forwarded-Proto': 'https',
+        })
+        response = conn.getresponse()
+        response.read()
+        return response.status
+    finally:
+        conn.close()
+
+
+def run_load(port, requests, total, concurrency):
+    """
+    Issue ``total`` GETs cycling through ``requests`` ((path, session key)
+    pairs) with ``concurrency`` in flight; returns throughput and latency.
+    """
+    host = request_host()
+    latencies, errors = [], []
+    lock = threading.Lock()
+    issued = iter(range(total))
+
+    def client():
+        while True:
+            with lock:
+                i = next(issued, None)
+            if i is None:
+                return
+            path, session_key = requests[i % len(requests)]
+            start = time.perf_counter()
+            status = fetch(port, host, path, session_key)
+            elapsed = (time.perf_counter() - start) * 1000
+            with lock:
+                latencies.append(elapsed)
+                if status != 200:
+                    errors.append((path, status))
+
+    threads = [threading.Thread(target=client) for _ in range(concurrency)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    wall = time.perf_counter() - start
+
+    return {
+        'rps': len(latencies) / wall,
+        'p50_ms': statistics.median(latencies),
+        'p99_ms': percentile(latencies, 99),
+        'errors': len(errors),
+        'first_error': errors[0] if errors else None,
+    }
+
+
+def warm_server(port, requests, times=1):
+    host = request_host()
+    for path, session_key in requests * times:
+        fetch(port, host, path, session_key)
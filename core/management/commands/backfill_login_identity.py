@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+from core.auth import rebuild_login_identities
+from core.models import LOGIN_MODELS
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the login identity table from Admin, Teacher and Student'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--role', choices=sorted(LOGIN_MODELS), help='Only rebuild one role')
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        roles = [options['role']] if options['role'] else list(LOGIN_MODELS)
+        for role in roles:
+            created = rebuild_login_identities(role, options['batch_size'])
+            self.stdout.write(f'{role.title()} identities: {created}')
+        self.stdout.write(self.style.SUCCESS('Login identities rebuilt successfully!'))
@@ -0,0 +1,74 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.urls import reverse
+
+from core.loadtest import (
+    create_role_sessions, delete_role_sessions, free_port, run_load, start_gunicorn, stop_gunicorn, warm_server,
+)
+
+
+# gunicorn arguments for the WSGI deployment (Procfile) and for asgi.py under uvicorn workers
+PROFILES = {
+    'wsgi': ['school_management.wsgi:application', '--threads', '1'],
+    'asgi': ['school_management.asgi:application', '-k', 'uvicorn.workers.UvicornWorker'],
+}
+
+# The read-heavy dashboards and history pages, by the role whose session they need
+ROUTES = {
+    'admin': ['admin_dashboard'],
+    'teacher': ['teacher_dashboard', 'teacher_attendance_history'],
+    'student': ['student_dashboard', 'student_attendance_history', 'student_fees_history'],
+}
+
+
+class Command(BaseCommand):
+    help = ('Serve the dashboards and history pages with gunicorn sync (WSGI) and uvicorn (ASGI) workers '
+            'and compare throughput under concurrent requests at the same worker count')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=1, help='gunicorn workers for both profiles')
+        parser.add_argument('--concurrency', type=int, default=20, help='Requests in flight at once')
+        parser.add_argument('--requests', type=int, default=300, help='Timed requests per profile')
+        parser.add_argument('--profiles', default='wsgi,asgi', help='Comma separated, from: wsgi, asgi')
+
+    def handle(self, *args, **options):
+        profiles = [name for name in options['profiles'].split(',') if name]
+        unknown = set(profiles) - set(PROFILES)
+        if unknown:
+            raise CommandError(f'Unknown profile: {", ".join(sorted(unknown))}')
+
+        sessions = create_role_sessions()
+        try:
+            requests = [(reverse(name), sessions[role]) for role, names in ROUTES.items() for name in names]
+            results = {}
+            for profile in profiles:
+                results[profile] = self.run_profile(profile, requests, options)
+                self.report(profile, results[profile])
+        finally:
+            delete_role_sessions(sessions)
+
+        if 'wsgi' in results and 'asgi' in results and results['wsgi']['rps']:
+            ratio = results['asgi']['rps'] / results['wsgi']['rps']
+            self.stdout.write(self.style.SUCCESS(
+                f'ASGI throughput x{ratio:.2f} of WSGI with {options["workers"]} worker(s) '
+                f'and {options["concurrency"]} concurrent requests'
+            ))
+
+    def run_profile(self, profile, requests, options):
+        port = free_port()
+        args = [*PROFILES[profile], '--workers', str(options['workers'])]
+        server = start_gunicorn(args, port, profile)
+        try:
+            # Warm every worker's imports, templates and connections
+            warm_server(port, requests, options['workers'])
+            return run_load(port, requests, options['requests'], options['concurrency'])
+        finally:
+            stop_gunicorn(server)
+
+    def report(self, profile, result):
+        if result['errors']:
+            path, status = result['first_error']
+            self.stderr.write(f'{profile}: {result["errors"]} non-200 responses, e.g. {status} for {path}')
+        self.stdout.write(
+            f'{profile}: {result["rps"]:8.1f} req/s  p50 {result["p50_ms"]:8.2f} ms  '
+            f'p99 {result["p99_ms"]:8.2f} ms  {result["errors"]} errors'
+        )
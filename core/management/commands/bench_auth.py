@@ -0,0 +1,82 @@
+import time
+
+from django.contrib.messages.storage.fallback import FallbackStorage
+from django.contrib.sessions.backends.base import SessionBase
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.http import HttpResponse
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+
+from core.auth import admin_required, forget_default_admin
+from core.models import Admin
+
+
+class MemorySession(SessionBase):
+    """Session kept in memory, counting how often it would be saved"""
+
+    def load(self):
+        return {}
+
+    def exists(self, session_key):
+        return False
+
+
+def legacy_admin_required(view_func):
+    """The per-request Admin.objects.first() decorator, kept for comparison"""
+    def wrapper(request, *args, **kwargs):
+        if request.session.get('user_role') != 'admin':
+            admin = Admin.objects.first()
+            if admin:
+                request.session['user_id'] = admin.id
+                request.session['user_role'] = 'admin'
+                request.session['user_name'] = admin.full_name
+        return view_func(request, *args, **kwargs)
+    return wrapper
+
+
+def view(request):
+    return HttpResponse()
+
+
+class Command(BaseCommand):
+    help = 'Measure admin_required overhead per request, legacy vs cached identity resolver'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=20000)
+
+    def handle(self, *args, **options):
+        if not Admin.objects.exists():
+            raise CommandError('No admin found. Run `manage.py create_admin` first.')
+        forget_default_admin()
+        factory = RequestFactory()
+        iterations = options['iterations']
+
+        for label, decorator in (('legacy', legacy_admin_required), ('cached', admin_required)):
+            wrapped = decorator(view)
+            for scenario in ('anonymous', 'signed-in'):
+                session = MemorySession()
+                if scenario == 'signed-in':
+                    wrapped(self.request(factory, session))
+                writes = 0
+                with CaptureQueriesContext(connection) as queries:
+                    start = time.perf_counter()
+                    for _ in range(iterations):
+                        if scenario == 'anonymous':
+                            session = MemorySession()
+                        request = self.request(factory, session)
+                        session.modified = False
+                        wrapped(request)
+                        writes += session.modified
+                    elapsed = time.perf_counter() - start
+                self.stdout.write(
+                    f'{label:>7} {scenario:>10}: {elapsed / iterations * 1e6:8.2f} us/request  '
+                    f'{len(queries) / iterations:5.2f} queries/request  '
+                    f'{writes / iterations:5.2f} session writes/request'
+                )
+
+    def request(self, factory, session):
+        request = factory.get('/admin-panel/')
+        request.session = session
+        request._messages = FallbackStorage(request)
+        return request
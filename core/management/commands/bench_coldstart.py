@@ -0,0 +1,89 @@
+import importlib
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.test import Client
+from django.test.utils import override_settings
+from django.urls import reverse
+
+from core.template_cache import template_cache_stats
+
+
+# Pages whose templates pull in the shared partials (header, sidebar, footer, pagination)
+ROUTES = ['home', 'login', 'admin_dashboard', 'student_list', 'teacher_list', 'class_list',
+          'student_attendance_mark', 'fees_list']
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = ('Start fresh processes with and without template warmup and measure startup and '
+            'the first request to each page')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--runs', type=int, default=5, help='Fresh processes per mode')
+        parser.add_argument('--child', action='store_true', help='Internal: measure this process and print JSON')
+
+    def handle(self, *args, **options):
+        if options['child']:
+            self.stdout.write(json.dumps(self.measure()))
+            return
+
+        results = {}
+        for mode, warmup in (('cold', 'False'), ('warm', 'True')):
+            runs = [self.spawn(warmup) for _ in range(options['runs'])]
+            results[mode] = runs
+            startup = statistics.median(run['startup_ms'] for run in runs)
+            first = statistics.median(sum(run['first_ms'].values()) for run in runs)
+            second = statistics.median(sum(run['second_ms'].values()) for run in runs)
+            stats = runs[-1]['templates']
+            self.stdout.write(
+                f'{mode}: startup {startup:7.1f} ms  first requests {first:7.1f} ms  '
+                f'repeat requests {second:7.1f} ms  ({stats["warmed"]} templates warmed, '
+                f'{stats["hits"]} cache hits / {stats["misses"]} misses while serving)'
+            )
+
+        self.stdout.write('\nFirst request per page (median ms):')
+        for name in ROUTES:
+            cold = statistics.median(run['first_ms'][name] for run in results['cold'])
+            warm = statistics.median(run['first_ms'][name] for run in results['warm'])
+            self.stdout.write(f'{name:<28} cold {cold:7.2f}  warm {warm:7.2f}')
+
+    def spawn(self, warmup):
+        env = dict(os.environ, TEMPLATE_WARMUP=warmup)
+        command = [sys.executable, str(settings.BASE_DIR / 'manage.py'), 'bench_coldstart', '--child']
+        completed = subprocess.run(command, env=env, capture_output=True, text=True, cwd=settings.BASE_DIR)
+        if completed.returncode != 0:
+            raise CommandError(f'Child process failed:\n{completed.stderr}')
+        return json.loads(completed.stdout.strip().splitlines()[-1])
+
+    def measure(self):
+        """Run inside a fresh process: import the WSGI app, then time two passes over ROUTES"""
+        start = time.perf_counter()
+        importlib.import_module(settings.WSGI_APPLICATION.rsplit('.', 1)[0])
+        startup_ms = (time.perf_counter() - start) * 1000
+
+        first, second = {}, {}
+        try:
+            with transaction.atomic(), override_settings(ALLOWED_HOSTS=['*'], RATELIMIT_ENABLED=False):
+                client = Client()
+                for timings in (first, second):
+                    for name in ROUTES:
+                        url = reverse(name)
+                        started = time.perf_counter()
+                        client.get(url)
+                        timings[name] = (time.perf_counter() - started) * 1000
+                # Sessions written by the admin auto sign-in are not kept
+                raise Rollback
+        except Rollback:
+            pass
+        return {'startup_ms': startup_ms, 'first_ms': first, 'second_ms': second, 'templates': template_cache_stats()}
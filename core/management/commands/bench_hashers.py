@@ -0,0 +1,80 @@
+import statistics
+import time
+
+from django.contrib.auth.hashers import (
+    Argon2PasswordHasher, PBKDF2PasswordHasher, ScryptPasswordHasher, get_hasher,
+)
+from django.core.management.base import BaseCommand
+
+from core.hashers import hasher_workers, set_passwords_bulk
+
+
+class Target:
+    """Stand-in with a password attribute for set_passwords_bulk"""
+    password = None
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+class Command(BaseCommand):
+    help = 'Compare PBKDF2, Argon2 and scrypt hash/verify latency per core at several costs'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--samples', type=int, default=20, help='Hashes timed per configuration')
+        parser.add_argument('--pbkdf2-iterations', default='100000,300000,600000',
+                            help='Extra PBKDF2 iteration counts to compare, comma separated')
+        parser.add_argument('--budget-ms', type=float, default=250.0,
+                            help='Login p99 budget a single verify must fit in')
+        parser.add_argument('--workers', type=int, help='Also measure bulk hashing with this many processes')
+
+    def handle(self, *args, **options):
+        configs = [('configured', get_hasher())]
+        for iterations in filter(None, options['pbkdf2_iterations'].split(',')):
+            hasher = PBKDF2PasswordHasher()
+            hasher.iterations = int(iterations)
+            configs.append((f'iterations={int(iterations)}', hasher))
+        configs.append(('default', ScryptPasswordHasher()))
+        configs.append(('default', Argon2PasswordHasher()))
+
+        for label, hasher in configs:
+            try:
+                hash_ms, verify_ms = self.measure(hasher, options['samples'])
+            except ValueError as e:
+                # Argon2 without argon2-cffi installed
+                self.stdout.write(f'{hasher.algorithm:>14} {label:>18}: skipped ({e})')
+                continue
+            p99 = percentile(verify_ms, 99)
+            fits = self.style.SUCCESS('ok') if p99 <= options['budget_ms'] else self.style.ERROR('over budget')
+            self.stdout.write(
+                f'{hasher.algorithm:>14} {label:>18}: '
+                f'hash p50 {statistics.median(hash_ms):7.1f} ms  '
+                f'verify p50 {statistics.median(verify_ms):7.1f} ms  p99 {p99:7.1f} ms  '
+                f'{1000 / statistics.median(hash_ms):7.1f} hashes/s/core  {fits}'
+            )
+
+        if options['workers']:
+            self.bulk(options['samples'] * 4, options['workers'])
+
+    def measure(self, hasher, samples):
+        hash_ms, verify_ms = [], []
+        for i in range(samples):
+            password = f'bench-password-{i}'
+            start = time.perf_counter()
+            encoded = hasher.encode(password, hasher.salt())
+            hash_ms.append((time.perf_counter() - start) * 1000)
+            start = time.perf_counter()
+            hasher.verify(password, encoded)
+            verify_ms.append((time.perf_counter() - start) * 1000)
+        return hash_ms, verify_ms
+
+    def bulk(self, count, workers):
+        passwords = [f'bench-password-{i}' for i in range(count)]
+        for label, n in (('serial', 1), (f'{hasher_workers(workers)} workers', workers)):
+            targets = [Target() for _ in passwords]
+            start = time.perf_counter()
+            set_passwords_bulk(targets, passwords, workers=n)
+            elapsed = time.perf_counter() - start
+            self.stdout.write(f'set_passwords_bulk {label:>12}: {count / elapsed:8.1f} hashes/s')
@@ -0,0 +1,72 @@
+import logging
+import time
+
+from django.core.cache import caches
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.test import Client
+from django.test.utils import override_settings
+
+from core.models import Teacher
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = 'Simulate a bad-password login burst and compare worker CPU with and without rate limiting'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--attempts', type=int, default=200, help='Bad logins in the burst')
+        parser.add_argument('--attackers', type=int, default=1, help='Distinct client IPs in the burst')
+
+    def handle(self, *args, **options):
+        # Every throttled request would log a "Too Many Requests" warning
+        logging.getLogger('django.request').setLevel(logging.ERROR)
+        try:
+            with transaction.atomic(), override_settings(ALLOWED_HOSTS=['*']):
+                teacher = Teacher(username='bench-ratelimit', name='Bench', surname='Teacher',
+                                  email='bench-ratelimit@example.com', gender='other',
+                                  employee_id='BENCH-RATELIMIT')
+                teacher.set_password('correct-password')
+                teacher.save()
+                for enabled in (False, True):
+                    with override_settings(RATELIMIT_ENABLED=enabled):
+                        self.run(enabled, options['attempts'], options['attackers'])
+                raise Rollback
+        except Rollback:
+            pass
+
+    def run(self, enabled, attempts, attackers):
+        for alias in caches:
+            caches[alias].clear()
+        client = Client()
+        statuses = {}
+        cpu = time.process_time()
+        wall = time.perf_counter()
+        for i in range(attempts):
+            response = client.post(
+                '/login/',
+                {'role': 'teacher', 'username': 'bench-ratelimit', 'password': f'guess-{i}'},
+                REMOTE_ADDR=f'203.0.113.{i % attackers + 1}',
+            )
+            statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+        cpu = time.process_time() - cpu
+        wall = time.perf_counter() - wall
+
+        start = time.perf_counter()
+        legit = Client().post(
+            '/login/',
+            {'role': 'admin', 'username': 'bench-nobody', 'password': 'x'},
+            REMOTE_ADDR='198.51.100.7',
+        )
+        legit_ms = (time.perf_counter() - start) * 1000
+
+        label = 'limited' if enabled else 'unlimited'
+        self.stdout.write(
+            f'{label:>9}: {cpu:6.2f}s CPU for {attempts} attempts '
+            f'({cpu / attempts * 1000:7.2f} ms/attempt, wall {wall:6.2f}s)  '
+            f'responses {dict(sorted(statuses.items()))}  '
+            f'other client during burst: {legit.status_code} in {legit_ms:.1f} ms'
+        )
@@ -0,0 +1,240 @@
+import json
+import logging
+import platform
+import statistics
+import time
+import tracemalloc
+
+import django
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import URLPattern, reverse
+
+from core import urls as core_urls
+from core.models import Admin, Class, Subject, Teacher, Student, Fees, Salary, StudentAttendance
+from core.seeding import SchoolSeeder
+
+
+# Objects used for <int:pk> routes, by view name prefix
+PK_MODELS = {
+    'student': Student,
+    'teacher': Teacher,
+    'class': Class,
+    'subject': Subject,
+    'fees': Fees,
+    'salary': Salary,
+}
+
+# Routes also measured with a POST; none of them deletes anything
+POST_ROUTES = ('student_attendance_mark', 'teacher_attendance_mark', 'teacher_mark_student_attendance')
+
+# Routes that list nobody until a class is picked; measured with the sample student's class
+CLASS_ROUTES = ('student_attendance_mark', 'teacher_mark_student_attendance')
+
+# Session role each URL prefix needs
+ROLE_PREFIXES = (('/admin-panel/', 'admin'), ('/teacher/', 'teacher'), ('/student/', 'student'))
+
+
+class Rollback(Exception):
+    pass
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round((len(ordered) - 1) * pct / 100)))]
+
+
+class Command(BaseCommand):
+    help = ('Measure latency percentiles, queries and allocations for every named route in core/urls.py, '
+            'optionally comparing against a saved baseline')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=20, help='Timed requests per route')
+        parser.add_argument('--warmup', type=int, default=2, help='Untimed requests per route first')
+        parser.add_argument('--routes', help='Only these route names, comma separated')
+        parser.add_argument('--seed-students', type=int, default=0,
+                            help='Seed this many students first (rolled back afterwards) instead of using existing data')
+        parser.add_argument('--seed-days', type=int, default=20)
+        parser.add_argument('-o', '--output', help='Write results to this JSON file')
+        parser.add_argument('--compare', help='Baseline JSON file from an earlier --output')
+        parser.add_argument('--threshold', type=float, default=10.0,
+                            help='Percent p50 slowdown reported as a regression')
+        parser.add_argument('--fail-on-regression', action='store_true')
+
+    def handle(self, *args, **options):
+        # Throttled or failing requests would log a line each
+        logging.getLogger('django.request').setLevel(logging.CRITICAL)
+        results = {}
+        try:
+            with transaction.atomic(), override_settings(
+                ALLOWED_HOSTS=['*'], RATELIMIT_ENABLED=False, QUERY_BUDGET_STRICT=False,
+            ):
+                if options['seed_students']:
+                    SchoolSeeder(students=options['seed_students'], days=options['seed_days'],
+                                 prefix='bench', skip_passwords=True).run()
+                results = self.run(options)
+                # Attendance POSTs must not leave rows behind
+                raise Rollback
+        except Rollback:
+            pass
+
+        report = {
+            'meta': {
+                'iterations': options['iterations'],
+                'python': platform.python_version(),
+                'django': django.get_version(),
+                'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            },
+            'routes': results,
+        }
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                json.dump(report, f, indent=2, sort_keys=True)
+            self.stdout.write(f'Results written to {options["output"]}')
+        if options['compare']:
+            regressions = self.compare(results, options['compare'], options['threshold'])
+            if regressions and options['fail_on_regression']:
+                raise CommandError(f'Regressions: {", ".join(regressions)}')
+
+    def samples(self):
+        """Sample pks for detail routes and the accounts each role signs in as"""
+        student_id = StudentAttendance.objects.order_by('-date').values_list('student_id', flat=True).first()
+        student = Student.objects.filter(pk=student_id).first() or Student.objects.order_by('pk').first()
+        teacher = Teacher.objects.order_by('pk').first()
+        admin = Admin.objects.order_by('pk').first()
+        if not (student and teacher and admin):
+            raise CommandError('Need at least one admin, teacher and student: run create_admin and seed_school, '
+                               'or pass --seed-students.')
+        pks = {prefix: model.objects.order_by('pk').values_list('pk', flat=True).first()
+               for prefix, model in PK_MODELS.items()}
+        pks['student'], pks['teacher'] = student.pk, teacher.pk
+        fees = Fees.objects.filter(student=student).values_list('pk', flat=True).first()
+        if fees:
+            pks['fees'] = fees
+        return pks, {'admin': admin, 'teacher': teacher, 'student': student}
+
+    def client(self, account):
+        client = Client()
+        if account is not None:
+            session = client.session
+            session.update({'user_id': account.pk, 'user_role': account.LOGIN_ROLE, 'user_name': account.full_name})
+            session.save()
+            client.cookies['sessionid'] = session.session_key
+        return client
+
+    def routes(self, pks):
+        for pattern in core_urls.urlpatterns:
+            if not isinstance(pattern, URLPattern) or not pattern.name:
+                continue
+            kwargs = {}
+            converters = pattern.pattern.converters
+            if 'pk' in converters:
+                prefix = pattern.name.split('_')[0]
+                if pks.get(prefix) is None:
+                    continue
+                kwargs['pk'] = pks[prefix]
+            if 'kind' in converters:
+                kwargs['kind'] = 'students'
+            yield pattern.name, reverse(pattern.name, kwargs=kwargs)
+
+    def post_data(self, name, student, teacher):
+        if name == 'teacher_attendance_mark':
+            ids = Teacher.objects.values_list('pk', flat=True)
+        else:
+            ids = Student.objects.filter(student_class_id=student.student_class_id).values_list('pk', flat=True)
+        data = {f'status_{pk}': 'present' for pk in ids}
+        data['date'] = StudentAttendance.objects.order_by('-date').values_list('date', flat=True).first() or '2025-01-01'
+        return data
+
+    def run(self, options):
+        pks, accounts = self.samples()
+        wanted = set(filter(None, (options['routes'] or '').split(',')))
+        clients = {role: self.client(account) for role, account in accounts.items()}
+        clients[None] = self.client(None)
+
+        results = {}
+        for name, url in self.routes(pks):
+            if wanted and name not in wanted:
+                continue
+            role = next((role for prefix, role in ROLE_PREFIXES if url.startswith(prefix)), None)
+            if name in CLASS_ROUTES:
+                url += f'?class={accounts["student"].student_class_id}'
+            methods = [('GET', None)]
+            if name in POST_ROUTES:
+                methods.append(('POST', self.post_data(name, accounts['student'], accounts['teacher'])))
+            for method, data in methods:
+                key = name if method == 'GET' else f'{name} POST'
+                # logout flushes its session, so it gets a throwaway one each time
+                client = self.client(accounts['student']) if name == 'logout' else clients[role]
+                results[key] = self.measure(client, method, url, data, options['iterations'], options['warmup'])
+                self.report(key, results[key])
+        return results
+
+    def request(self, client, method, url, data):
+        response = client.post(url, data) if method == 'POST' else client.get(url)
+        if response.streaming:
+            b''.join(response.streaming_content)
+        return response
+
+    def measure(self, client, method, url, data, iterations, warmup):
+        for _ in range(warmup):
+            self.request(client, method, url, data)
+
+        timings, queries = [], []
+        status = None
+        for _ in range(iterations):
+            with CaptureQueriesContext(connection) as captured:
+                start = time.perf_counter()
+                response = self.request(client, method, url, data)
+                timings.append((time.perf_counter() - start) * 1000)
+            queries.append(len(captured))
+            status = response.status_code
+
+        tracemalloc.start()
+        self.request(client, method, url, data)
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        return {
+            'method': method,
+            'url': url,
+            'status': status,
+            'p50_ms': round(statistics.median(timings), 3),
+            'p90_ms': round(percentile(timings, 90), 3),
+            'p99_ms': round(percentile(timings, 99), 3),
+            'mean_ms': round(statistics.fmean(timings), 3),
+            'queries': max(queries),
+            'alloc_peak_kb': round(peak / 1024, 1),
+        }
+
+    def report(self, key, result):
+        self.stdout.write(
+            f'{key:<40} {result["status"]:>3}  p50 {result["p50_ms"]:8.2f} ms  p90 {result["p90_ms"]:8.2f} ms  '
+            f'p99 {result["p99_ms"]:8.2f} ms  {result["queries"]:3d} queries  {result["alloc_peak_kb"]:9.1f} KiB peak'
+        )
+
+    def compare(self, results, path, threshold):
+        with open(path) as f:
+            baseline = json.load(f)['routes']
+        self.stdout.write(f'\nCompared with {path}:')
+        regressions = []
+        for key, result in results.items():
+            before = baseline.get(key)
+            if before is None:
+                self.stdout.write(f'{key:<40} new route')
+                continue
+            change = (result['p50_ms'] - before['p50_ms']) / before['p50_ms'] * 100 if before['p50_ms'] else 0.0
+            query_change = result['queries'] - before['queries']
+            regressed = change > threshold or query_change > 0
+            line = (f'{key:<40} p50 {before["p50_ms"]:8.2f} -> {result["p50_ms"]:8.2f} ms ({change:+6.1f}%)  '
+                    f'queries {before["queries"]:3d} -> {result["queries"]:3d}')
+            if regressed:
+                regressions.append(key)
+                self.stdout.write(self.style.ERROR(f'{line}  REGRESSION'))
+            else:
+                self.stdout.write(line)
+        if not regressions:
+            self.stdout.write(self.style.SUCCESS('No regressions'))
+        return regressions
@@ -0,0 +1,112 @@
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+
+# SQLite defaults: rollback journal, full sync, no mmap
+DEFAULT_PRAGMAS = 'PRAGMA journal_mode=DELETE;PRAGMA synchronous=FULL;PRAGMA busy_timeout=5000'
+
+
+class Command(BaseCommand):
+    help = 'Measure SQLite read throughput while attendance writes run, before and after tuning'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--seconds', type=float, default=5.0, help='Duration of each run')
+        parser.add_argument('--readers', type=int, default=4, help='Concurrent reader threads')
+        parser.add_argument('--rows', type=int, default=50000, help='Rows seeded before the run')
+
+    def handle(self, *args, **options):
+        tuned = settings.DATABASES['default'].get('OPTIONS', {}).get('init_command', '')
+        results = []
+        for label, pragmas in (('default', DEFAULT_PRAGMAS), ('tuned', tuned)):
+            with tempfile.TemporaryDirectory() as tmp:
+                path = os.path.join(tmp, 'bench.sqlite3')
+                self.seed(path, pragmas, options['rows'])
+                reads, writes, busy = self.run(path, pragmas, options['seconds'], options['readers'])
+            results.append((label, reads, writes, busy))
+            self.stdout.write(
+                f'{label:>8}: {reads / options["seconds"]:10.0f} reads/s  '
+                f'{writes / options["seconds"]:8.0f} writes/s  {busy} busy errors'
+            )
+
+        base, after = results[0][1] or 1, results[1][1]
+        self.stdout.write(self.style.SUCCESS(f'Read throughput x{after / base:.2f} with tuned pragmas'))
+
+    def connect(self, path, pragmas):
+        conn = sqlite3.connect(path, timeout=5, isolation_level=None, check_same_thread=False)
+        for pragma in pragmas.split(';'):
+            if pragma.strip():
+                conn.execute(pragma)
+        return conn
+
+    def seed(self, path, pragmas, rows):
+        conn = self.connect(path, pragmas)
+        conn.execute(
+            'CREATE TABLE attendance (id INTEGER PRIMARY KEY, student_id INTEGER, '
+            'date TEXT, status TEXT, UNIQUE (student_id, date))'
+        )
+        conn.execute('BEGIN')
+        conn.executemany(
+            'INSERT INTO attendance (student_id, date, status) VALUES (?, ?, ?)',
+            ((i % 2000, f'2025-{1 + i // 2000 % 12:02d}-{1 + i // 24000 % 28:02d}', 'present') for i in range(rows)),
+        )
+        conn.execute('COMMIT')
+        conn.close()
+
+    def run(self, path, pragmas, seconds, readers):
+        stop = threading.Event()
+        counts = {'reads': 0, 'writes': 0, 'busy': 0}
+        lock = threading.Lock()
+
+        def reader():
+            conn = self.connect(path, pragmas)
+            done = 0
+            while not stop.is_set():
+                try:
+                    conn.execute(
+                        "SELECT status, COUNT(*) FROM attendance WHERE student_id = ? GROUP BY status",
+                        (done % 2000,),
+                    ).fetchall()
+                    done += 1
+                except sqlite3.OperationalError:
+                    with lock:
+                        counts['busy'] += 1
+            conn.close()
+            with lock:
+                counts['reads'] += done
+
+        def writer():
+            conn = self.connect(path, pragmas)
+            day = 0
+            while not stop.is_set():
+                day += 1
+                try:
+                    conn.execute('BEGIN IMMEDIATE')
+                    conn.executemany(
+                        'INSERT OR REPLACE INTO attendance (student_id, date, status) VALUES (?, ?, ?)',
+                        ((sid, f'2026-{day:05d}', 'absent') for sid in range(60)),
+                    )
+                    conn.execute('COMMIT')
+                    with lock:
+                        counts['writes'] += 1
+                except sqlite3.OperationalError:
+                    if conn.in_transaction:
+                        conn.execute('ROLLBACK')
+                    with lock:
+                        counts['busy'] += 1
+            conn.close()
+
+        threads = [threading.Thread(target=writer)]
+        threads += [threading.Thread(target=reader) for _ in range(readers)]
+        for thread in threads:
+            thread.start()
+        time.sleep(seconds)
+        stop.set()
+        for thread in threads:
+            thread.join()
+        return counts['reads'], counts['writes'], counts['busy']
@@ -0,0 +1,100 @@
+import os
+
+from django.core.management.base import BaseCommand, CommandError
+from django.urls import reverse
+
+from core.loadtest import (
+    create_role_sessions, delete_role_sessions, free_port, run_load, start_gunicorn, stop_gunicorn, warm_server,
+)
+
+
+# A mix of admin, teacher and student pages, by the role whose session they need
+ROUTES = {
+    'admin': ['admin_dashboard', 'student_list', 'class_list', 'student_attendance_list'],
+    'teacher': ['teacher_dashboard', 'teacher_attendance_history'],
+    'student': ['student_dashboard', 'student_attendance_history', 'student_fees_history'],
+}
+
+
+class Command(BaseCommand):
+    help = ('Run the gunicorn.conf.py profile pinned to 1..N CPUs and measure how throughput scales '
+            '(workers and threads are sized by the profile from the CPUs it is given)')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--cores', help='Core counts to try, comma separated (default: 1 up to all)')
+        parser.add_argument('--concurrency', type=int, default=32, help='Requests in flight at once')
+        parser.add_argument('--requests', type=int, default=1000, help='Timed requests per core count')
+        parser.add_argument('--workers', type=int, help='Override WEB_CONCURRENCY instead of autotuning')
+        parser.add_argument('--threads', type=int, help='Override GUNICORN_THREADS')
+
+    def handle(self, *args, **options):
+        if not hasattr(os, 'sched_setaffinity'):
+            raise CommandError('CPU pinning needs Linux (os.sched_setaffinity).')
+        available = sorted(os.sched_getaffinity(0))
+        if options['cores']:
+            counts = [int(count) for count in options['cores'].split(',')]
+        else:
+            counts = list(range(1, len(available) + 1))
+        if max(counts) > len(available):
+            raise CommandError(f'Only {len(available)} CPUs available.')
+
+        env = dict(os.environ)
+        if options['workers']:
+            env['WEB_CONCURRENCY'] = str(options['workers'])
+        if options['threads']:
+            env['GUNICORN_THREADS'] = str(options['threads'])
+
+        sessions = create_role_sessions()
+        results = {}
+        try:
+            requests = [(reverse(name), sessions[role]) for role, names in ROUTES.items() for name in names]
+            for count in counts:
+                results[count] = self.run_pinned(available[:count], available[count:], requests, env, options)
+                self.report(count, results[count], results[counts[0]]['rps'] / counts[0])
+        finally:
+            os.sched_setaffinity(0, available)
+            delete_role_sessions(sessions)
+
+        if len(available) == max(counts):
+            self.stdout.write(self.style.WARNING(
+                'The load generator shared CPUs with the server on the largest run; '
+                'leave a core free for it for cleaner numbers.'
+            ))
+
+    def run_pinned(self, server_cpus, client_cpus, requests, env, options):
+        port = free_port()
+        # Recycling is switched off so no worker restarts in the middle of a run
+        server = start_gunicorn(
+            ['school_management.wsgi:application', '--max-requests', '0'], port, f'{len(server_cpus)}-CPU',
+            env=env, preexec_fn=lambda: os.sched_setaffinity(0, server_cpus),
+        )
+        try:
+            warm_server(port, requests)
+            workers = self.worker_count(server.pid)
+            warm_server(port, requests, workers)
+            if client_cpus:
+                os.sched_setaffinity(0, client_cpus)
+            result = run_load(port, requests, options['requests'], options['concurrency'])
+            result['workers'] = workers
+            return result
+        finally:
+            stop_gunicorn(server)
+
+    def worker_count(self, pid):
+        """Worker processes the gunicorn master forked, as sized by gunicorn.conf.py"""
+        try:
+            with open(f'/proc/{pid}/task/{pid}/children') as f:
+                return len(f.read().split())
+        except OSError:
+            return 1
+
+    def report(self, count, result, base_rps_per_core):
+        if result['errors']:
+            path, status = result['first_error']
+            self.stderr.write(f'{count} CPU(s): {result["errors"]} non-200 responses, e.g. {status} for {path}')
+        speedup = result['rps'] / base_rps_per_core if base_rps_per_core else 0
+        self.stdout.write(
+            f'{count:2d} CPU(s), {result["workers"]:2d} workers: {result["rps"]:8.1f} req/s  '
+            f'p50 {result["p50_ms"]:8.2f} ms  p99 {result["p99_ms"]:8.2f} ms  '
+            f'x{speedup:.2f} of one CPU ({speedup / count:.0%} efficiency)'
+        )
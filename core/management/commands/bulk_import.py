@@ -0,0 +1,47 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from core.imports import IMPORTS, FORMATS, ImportFileError, detect_format, import_file, write_error_report
+
+
+class Command(BaseCommand):
+    help = 'Import students or teachers from a CSV or JSONL file'
+
+    def add_arguments(self, parser):
+        parser.add_argument('kind', choices=sorted(IMPORTS))
+        parser.add_argument('file')
+        parser.add_argument('--format', choices=FORMATS, help='Default: from the file extension')
+        parser.add_argument('--chunk-size', type=int, default=1000, help='Rows validated and inserted per batch')
+        parser.add_argument('--workers', type=int, help='Password hashing processes (default: CPU count)')
+        parser.add_argument('--dry-run', action='store_true', help='Validate only, do not save')
+        parser.add_argument('--errors', help='Write skipped rows to this CSV file')
+
+    def handle(self, *args, **options):
+        fmt = options['format'] or detect_format(options['file'])
+        start = time.perf_counter()
+        try:
+            with open(options['file'], encoding='utf-8-sig', newline='') as stream:
+                result = import_file(
+                    options['kind'],
+                    stream,
+                    fmt,
+                    chunk_size=options['chunk_size'],
+                    workers=options['workers'],
+                    dry_run=options['dry_run'],
+                )
+        except (OSError, ImportFileError) as e:
+            raise CommandError(str(e))
+        elapsed = time.perf_counter() - start
+
+        if options['errors'] and result.errors:
+            with open(options['errors'], 'w', newline='') as report:
+                write_error_report(result.errors, report)
+
+        verb = 'Validated' if options['dry_run'] else 'Imported'
+        self.stdout.write(self.style.SUCCESS(
+            f'{verb} {result.created} {options["kind"]} in {elapsed:.1f}s, skipped {len(result.errors)} rows'
+        ))
+        for error in result.errors[:10]:
+            self.stdout.write(f'  line {error.line}: {"; ".join(error.messages)}')
+        if len(result.errors) > 10 and not options['errors']:
+            self.stdout.write('  ... use --errors to write the full report')
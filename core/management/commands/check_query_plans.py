@@ -0,0 +1,74 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from core.models import StudentAttendance
+from core.query_plans import hot_queries, uses_index
+from core.seeding import SchoolSeeder
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = 'EXPLAIN the hot attendance/student queries and fail if any scans a whole table or index'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=0,
+                            help='Seed this many student attendance rows first, e.g. 1000000 '
+                                 '(inside a transaction that is rolled back; holds the write lock meanwhile)')
+        parser.add_argument('--students', type=int, default=2000, help='Students to spread seeded rows over')
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'sqlite':
+            raise CommandError('Query plans are only checked on SQLite.')
+        failures = []
+        try:
+            with transaction.atomic():
+                if options['rows']:
+                    self.seed(options['rows'], options['students'])
+                failures = self.check_plans()
+                raise Rollback
+        except Rollback:
+            pass
+        if failures:
+            raise CommandError(f'Full scan in: {", ".join(failures)}')
+        self.stdout.write(self.style.SUCCESS('All hot queries use indexes'))
+
+    def seed(self, rows, students):
+        seeder = SchoolSeeder(students=students, teachers=50, days=-(-rows // students),
+                              prefix='plan', skip_passwords=True, log=self.stdout.write)
+        seeder.run()
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+
+    def check_plans(self):
+        queries = hot_queries()
+        if queries is None:
+            raise CommandError('Need student and teacher attendance rows; pass --rows to seed.')
+
+        failures = []
+        for label, model, queryset in queries:
+            plan = queryset.explain()
+            started = time.perf_counter()
+            count = len(queryset)
+            elapsed = (time.perf_counter() - started) * 1000
+            ok = uses_index(plan, model._meta.db_table)
+            status = self.style.SUCCESS('index') if ok else self.style.ERROR('SCAN')
+            self.stdout.write(f'{label:<32} {status:>6}  {count:7d} rows  {elapsed:8.2f} ms')
+            for line in plan.splitlines():
+                self.stdout.write(f'    {line}')
+            if not ok:
+                failures.append(label)
+
+        student_id, latest = StudentAttendance.objects.order_by('-date').values_list('student_id', 'date').first()
+        legacy = StudentAttendance.objects.filter(student_id=student_id, date__year=latest.year, date__month=latest.month)
+        started = time.perf_counter()
+        len(legacy)
+        self.stdout.write(
+            f'{"(old date__year/date__month filter)":<32} {"":>6}  '
+            f'{"":7}       {(time.perf_counter() - started) * 1000:8.2f} ms, for comparison'
+        )
+        return failures
@@ -0,0 +1,44 @@
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+from core.exports import EXPORTS, FORMATS, ExportError, parse_date, stream_export
+
+
+class Command(BaseCommand):
+    help = 'Stream students, attendance, fees or salary to a CSV or JSONL file'
+
+    def add_arguments(self, parser):
+        parser.add_argument('kind', choices=sorted(EXPORTS))
+        parser.add_argument('--format', choices=sorted(FORMATS), default='csv')
+        parser.add_argument('--from', dest='date_from', help='First date (YYYY-MM-DD)')
+        parser.add_argument('--to', dest='date_to', help='Last date (YYYY-MM-DD)')
+        parser.add_argument('--class', dest='class_id', help='Only rows for this class id')
+        parser.add_argument('--gzip', action='store_true', help='Gzip the output')
+        parser.add_argument('--chunk-size', type=int, default=2000, help='Rows fetched per query')
+        parser.add_argument('-o', '--output', help='Output file (default: stdout)')
+
+    def handle(self, *args, **options):
+        try:
+            chunks = stream_export(
+                options['kind'],
+                options['format'],
+                date_from=parse_date(options['date_from']),
+                date_to=parse_date(options['date_to']),
+                class_id=options['class_id'],
+                compress=options['gzip'],
+                chunk_size=options['chunk_size'],
+            )
+        except ExportError as e:
+            raise CommandError(str(e))
+
+        output = open(options['output'], 'wb') if options['output'] else sys.stdout.buffer
+        written = 0
+        try:
+            for chunk in chunks:
+                output.write(chunk)
+                written += len(chunk)
+        finally:
+            if options['output']:
+                output.close()
+        if options['output']:
+            self.stdout.write(self.style.SUCCESS(f'Exported {written} bytes to {options["output"]}'))
@@ -0,0 +1,25 @@
+from datetime import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+from core.attendance import rebuild_monthly_summaries
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the monthly attendance rollup from raw attendance rows'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--month', help='Only rebuild one month (YYYY-MM)')
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        month = None
+        if options['month']:
+            try:
+                month = datetime.strptime(options['month'], '%Y-%m').date()
+            except ValueError:
+                raise CommandError('--month must be in YYYY-MM format.')
+
+        for person_field in ('student', 'teacher'):
+            written = rebuild_monthly_summaries(person_field, month, options['batch_size'])
+            self.stdout.write(f'{person_field.title()} summaries: {written}')
+        self.stdout.write(self.style.SUCCESS('Attendance summary rebuilt successfully!'))
@@ -0,0 +1,13 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from core.routers import REPLICA_ALIAS, refresh_replica
+
+
+class Command(BaseCommand):
+    help = 'Copy the primary database into the read replica using the SQLite backup API'
+
+    def handle(self, *args, **options):
+        if REPLICA_ALIAS not in settings.DATABASES:
+            raise CommandError('No replica configured. Set DB_REPLICA_PATH to enable it.')
+        path = refresh_replica()
+        self.stdout.write(self.style.SUCCESS(f'Replica refreshed: {path}'))
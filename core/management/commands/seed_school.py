@@ -0,0 +1,51 @@
+import time
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import IntegrityError
+
+from core.seeding import SchoolSeeder
+
+
+class Command(BaseCommand):
+    help = 'Generate synthetic classes, teachers, students, attendance, fees and salary for load testing'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--students', type=int, default=1000)
+        parser.add_argument('--teachers', type=int, default=50)
+        parser.add_argument('--classes', type=int, default=12)
+        parser.add_argument('--days', type=int, default=30, help='School days of attendance (Sundays skipped)')
+        parser.add_argument('--seed', type=int, default=0, help='Random seed; the same options and --end give the same data')
+        parser.add_argument('--end', help='Last attendance day, YYYY-MM-DD (default: today)')
+        parser.add_argument('--prefix', default='seed', help='Prefix for usernames, emails and codes')
+        parser.add_argument('--password', default='password', help='Password of every seeded account')
+        parser.add_argument('--skip-passwords', action='store_true', help='Store unusable passwords, no hashing')
+        parser.add_argument('--batch-size', type=int, default=10000)
+
+    def handle(self, *args, **options):
+        end = None
+        if options['end']:
+            try:
+                end = date.fromisoformat(options['end'])
+            except ValueError:
+                raise CommandError('--end must be in YYYY-MM-DD format.')
+
+        seeder = SchoolSeeder(
+            students=options['students'],
+            teachers=options['teachers'],
+            classes=options['classes'],
+            days=options['days'],
+            seed=options['seed'],
+            end=end,
+            prefix=options['prefix'],
+            password=options['password'],
+            skip_passwords=options['skip_passwords'],
+            batch_size=options['batch_size'],
+            log=self.stdout.write,
+        )
+        start = time.perf_counter()
+        try:
+            seeder.run()
+        except IntegrityError as e:
+            raise CommandError(f'{e}. Seed data with this prefix probably exists; use another --prefix.')
+        self.stdout.write(self.style.SUCCESS(f'School seeded in {time.perf_counter() - start:.1f}s'))
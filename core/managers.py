@@ -0,0 +1,85 @@
+"""
+QuerySets shared by the core views.
+
+Each ``for_list``/``for_detail`` method loads the relations a template
+dereferences in the same query (or one prefetch) and only the columns it
+renders, so a page costs a constant number of queries however many rows
+it shows.
+"""
+from django.db import models
+
+
+# Columns behind the __str__ of each model, for use in only()
+STUDENT_STR_FIELDS = ['name', 'surname', 'admission_no']
+TEACHER_STR_FIELDS = ['name', 'surname', 'employee_id']
+CLASS_STR_FIELDS = ['name', 'section']
+
+
+def _related(prefix, fields):
+    return [f'{prefix}__{field}' for field in fields]
+
+
+class StudentQuerySet(models.QuerySet):
+    def for_list(self):
+        return self.select_related('student_class').only(
+            'created_at', 'admission_no', 'name', 'surname', 'roll_no', 'mobile',
+            'student_class', *_related('student_class', CLASS_STR_FIELDS),
+        )
+
+    def for_detail(self):
+        return self.select_related('student_class')
+
+
+class TeacherQuerySet(models.QuerySet):
+    def for_list(self):
+        return self.only(
+            'created_at', 'employee_id', 'name', 'surname', 'email', 'mobile', 'qualification',
+        )
+
+    def for_detail(self):
+        return self.prefetch_related('subjects')
+
+
+class SubjectQuerySet(models.QuerySet):
+    def for_list(self):
+        return self.select_related('class_assigned').only(
+            'code', 'name', 'class_assigned', *_related('class_assigned', CLASS_STR_FIELDS),
+        )
+
+
+class StudentAttendanceQuerySet(models.QuerySet):
+    def for_list(self):
+        return self.select_related('student__student_class', 'marked_by').only(
+            'date', 'status',
+            'student', *_related('student', STUDENT_STR_FIELDS),
+            'student__student_class', *_related('student__student_class', CLASS_STR_FIELDS),
+            'marked_by', *_related('marked_by', TEACHER_STR_FIELDS),
+        )
+
+    def for_student_detail(self):
+        return self.select_related('marked_by').only(
+            'date', 'status', 'student', 'marked_by', *_related('marked_by', TEACHER_STR_FIELDS),
+        )
+
+
+class TeacherAttendanceQuerySet(models.QuerySet):
+    def for_list(self):
+        return self.select_related('teacher').only(
+            'date', 'status', 'remarks', 'teacher', *_related('teacher', TEACHER_STR_FIELDS),
+        )
+
+
+class FeesQuerySet(models.QuerySet):
+    def for_list(self):
+        return self.select_related('student').only(
+            'created_at', 'fee_type', 'amount', 'due_date', 'status',
+            'student', *_related('student', STUDENT_STR_FIELDS),
+        )
+
+
+class SalaryQuerySet(models.QuerySet):
+    def for_list(self):
+        return self.select_related('teacher').only(
+            'created_at', 'month', 'amount', 'paid_date', 'status',
+            'teacher', *_related('teacher', TEACHER_STR_FIELDS),
+        )
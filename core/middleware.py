@@ -0,0 +1,268 @@
+"""
+Request middleware for the core views.
+
+QueryMetricsMiddleware records query count, database time, template render
+time and wall time for every request that resolves to a named URL. Samples
+go to an in-process ring buffer summarised by the admin metrics endpoint
+(next to the template cache counters from core.template_cache), and each
+view is checked against its query budget from settings.
+
+ReplicaRoutingMiddleware marks read-only requests so core.routers can send
+their reads to the replica.
+
+Both also work in async mode, so asgi.py does not push every request
+through an extra thread hop in this part of the stack.
+"""
+import logging
+import threading
+import time
+from collections import deque, namedtuple
+from contextlib import ExitStack
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db import connections
+from django.template.base import Template
+
+from .routers import replica_available, reset_replica, use_replica
+from .template_cache import template_cache_stats
+
+
+logger = logging.getLogger(__name__)
+
+RequestSample = namedtuple(
+    'RequestSample',
+    ['view', 'method', 'status', 'queries', 'db_time', 'template_time', 'wall_time', 'timestamp'],
+)
+
+_samples = deque(maxlen=getattr(settings, 'QUERY_METRICS_BUFFER_SIZE', 1000))
+_samples_lock = threading.Lock()
+_current = ContextVar('request_metrics', default=None)
+
+
+class QueryBudgetExceeded(Exception):
+    """A view issued more queries than its budget allows (strict mode only)"""
+
+
+class RequestMetrics:
+    """Counters collected while a single request is being handled"""
+
+    def __init__(self):
+        self.queries = 0
+        self.db_time = 0.0
+        self.template_time = 0.0
+        self.template_depth = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries += 1
+            self.db_time += time.perf_counter() - start
+
+
+def _instrument_templates():
+    """Time top-level template renders for the request being measured"""
+    if getattr(Template.render, '_metrics_instrumented', False):
+        return
+    original_render = Template.render
+
+    def render(self, context):
+        metrics = _current.get()
+        if metrics is None or metrics.template_depth:
+            return original_render(self, context)
+        metrics.template_depth += 1
+        start = time.perf_counter()
+        try:
+            return original_render(self, context)
+        finally:
+            metrics.template_time += time.perf_counter() - start
+            metrics.template_depth -= 1
+
+    render._metrics_instrumented = True
+    Template.render = render
+
+
+def query_budget(view_name):
+    """Max queries allowed for a view, None when unlimited"""
+    budgets = getattr(settings, 'QUERY_BUDGETS', {})
+    return budgets.get(view_name, getattr(settings, 'QUERY_BUDGET_DEFAULT', None))
+
+
+def record_sample(sample):
+    with _samples_lock:
+        _samples.append(sample)
+
+
+def reset_samples():
+    with _samples_lock:
+        _samples.clear()
+
+
+def _percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def metrics_summary():
+    """Aggregate the ring buffer per view"""
+    with _samples_lock:
+        samples = list(_samples)
+
+    by_view = {}
+    for sample in samples:
+        by_view.setdefault(sample.view, []).append(sample)
+
+    summary = {}
+    for view, rows in sorted(by_view.items()):
+        queries = [row.queries for row in rows]
+        wall_ms = [row.wall_time * 1000 for row in rows]
+        budget = query_budget(view)
+        summary[view] = {
+            'requests': len(rows),
+            'queries_avg': round(sum(queries) / len(rows), 2),
+            'queries_max': max(queries),
+            'query_budget': budget,
+            'over_budget': sum(1 for q in queries if budget is not None and q > budget),
+            'db_ms_avg': round(sum(row.db_time for row in rows) * 1000 / len(rows), 3),
+            'template_ms_avg': round(sum(row.template_time for row in rows) * 1000 / len(rows), 3),
+            'wall_ms_avg': round(sum(wall_ms) / len(rows), 3),
+            'wall_ms_p50': round(_percentile(wall_ms, 50), 3),
+            'wall_ms_p95': round(_percentile(wall_ms, 95), 3),
+        }
+    return {'samples': len(samples), 'views': summary, 'templates': template_cache_stats()}
+
+
+def _wrap_connections(stack, metrics):
+    for connection in connections.all():
+        stack.enter_context(connection.execute_wrapper(metrics))
+
+
+class QueryMetricsMiddleware:
+    """Measure each request and enforce per-view query budgets"""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+        _instrument_templates()
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        metrics = RequestMetrics()
+        token = _current.set(metrics)
+        start = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                _wrap_connections(stack, metrics)
+                response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self.record(request, response, metrics, time.perf_counter() - start)
+
+    async def __acall__(self, request):
+        metrics = RequestMetrics()
+        token = _current.set(metrics)
+        start = time.perf_counter()
+        try:
+            # Views run their queries on the request's sync thread, whose
+            # connections are not the ones visible from the event loop
+            stack = ExitStack()
+            await sync_to_async(_wrap_connections)(stack, metrics)
+            try:
+                response = await self.get_response(request)
+            finally:
+                await sync_to_async(stack.close)()
+        finally:
+            _current.reset(token)
+        return self.record(request, response, metrics, time.perf_counter() - start)
+
+    def record(self, request, response, metrics, wall_time):
+        match = request.resolver_match
+        if match is None or not match.url_name:
+            return response
+
+        record_sample(RequestSample(
+            match.url_name, request.method, response.status_code, metrics.queries,
+            metrics.db_time, metrics.template_time, wall_time, time.time(),
+        ))
+
+        budget = query_budget(match.url_name)
+        if budget is not None and metrics.queries > budget:
+            message = (
+                f'{match.url_name} issued {metrics.queries} queries '
+                f'(budget {budget}) for {request.method} {request.path}'
+            )
+            if getattr(settings, 'QUERY_BUDGET_STRICT', False):
+                raise QueryBudgetExceeded(message)
+            logger.warning(message)
+        return response
+
+
+# ==================== READ REPLICA ====================
+
+REPLICA_PIN_SESSION_KEY = '_primary_pin_until'
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Read from the replica on safe requests, from the primary otherwise.
+
+    A session that has just written is pinned to the primary for
+    REPLICA_PIN_SECONDS so it reads its own writes until the replica has
+    been refreshed.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        if not replica_available():
+            return self.get_response(request)
+
+        pinned_until = request.session.get(REPLICA_PIN_SESSION_KEY, 0)
+        read_only = request.method in SAFE_METHODS and pinned_until < time.time()
+
+        token = use_replica(read_only)
+        try:
+            response = self.get_response(request)
+        finally:
+            reset_replica(token)
+
+        if request.method not in SAFE_METHODS:
+            request.session[REPLICA_PIN_SESSION_KEY] = time.time() + getattr(settings, 'REPLICA_PIN_SECONDS', 30)
+        return response
+
+    async def __acall__(self, request):
+        if not replica_available():
+            return await self.get_response(request)
+
+        pinned_until = await request.session.aget(REPLICA_PIN_SESSION_KEY, 0)
+        read_only = request.method in SAFE_METHODS and pinned_until < time.time()
+
+        token = use_replica(read_only)
+        try:
+            response = await self.get_response(request)
+        finally:
+            reset_replica(token)
+
+        if request.method not in SAFE_METHODS:
+            await request.session.aset(
+                REPLICA_PIN_SESSION_KEY, time.time() + getattr(settings, 'REPLICA_PIN_SECONDS', 30))
+        return response
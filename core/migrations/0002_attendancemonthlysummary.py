@@ -0,0 +1,50 @@
+# Generated by Django 6.0 on 2026-10-18 04:16
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, Q
+from django.db.models.functions import TruncMonth
+
+
+def backfill_summaries(apps, schema_editor):
+    """Populate the rollup from attendance recorded before this migration"""
+    Summary = apps.get_model('core', 'AttendanceMonthlySummary')
+    counts = {
+        status: Count('pk', filter=Q(status=status))
+        for status in ('absent', 'late', 'present')
+    }
+    for model_name, person_column in (('StudentAttendance', 'student_id'), ('TeacherAttendance', 'teacher_id')):
+        rows = (
+            apps.get_model('core', model_name).objects.order_by()
+            .annotate(month=TruncMonth('date'))
+            .values(person_column, 'month')
+            .annotate(**counts)
+        )
+        Summary.objects.bulk_create((Summary(**row) for row in rows.iterator()), batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AttendanceMonthlySummary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('month', models.DateField()),
+                ('present', models.IntegerField(default=0)),
+                ('absent', models.IntegerField(default=0)),
+                ('late', models.IntegerField(default=0)),
+                ('student', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='monthly_summaries', to='core.student')),
+                ('teacher', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='monthly_summaries', to='core.teacher')),
+            ],
+            options={
+                'verbose_name_plural': 'Attendance monthly summaries',
+                'constraints': [models.UniqueConstraint(fields=('student', 'month'), name='unique_student_month_summary'), models.UniqueConstraint(fields=('teacher', 'month'), name='unique_teacher_month_summary')],
+            },
+        ),
+        migrations.RunPython(backfill_summaries, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,46 @@
+# Generated by Django 6.0 on 2026-10-18 04:35
+
+from django.db import migrations, models
+
+
+def backfill_identities(apps, schema_editor):
+    """One identity per existing Admin, Teacher and Student"""
+    LoginIdentity = apps.get_model('core', 'LoginIdentity')
+    for model_name, role in (('Admin', 'admin'), ('Teacher', 'teacher'), ('Student', 'student')):
+        rows = apps.get_model('core', model_name).objects.values_list('pk', 'username', 'password', 'name', 'surname')
+        LoginIdentity.objects.bulk_create(
+            (
+                LoginIdentity(
+                    username=username, role=role, object_id=pk, password=password,
+                    full_name=f'{name} {surname}',
+                )
+                for pk, username, password, name, surname in rows.iterator()
+            ),
+            batch_size=1000,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_list_pagination_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LoginIdentity',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('username', models.CharField(max_length=50)),
+                ('role', models.CharField(choices=[('admin', 'Admin'), ('teacher', 'Teacher'), ('student', 'Student')], max_length=10)),
+                ('object_id', models.BigIntegerField()),
+                ('password', models.CharField(max_length=255)),
+                ('full_name', models.CharField(max_length=201)),
+            ],
+            options={
+                'verbose_name_plural': 'Login identities',
+                'constraints': [models.UniqueConstraint(fields=('username', 'role'), name='unique_login_username_role'), models.UniqueConstraint(fields=('role', 'object_id'), name='unique_login_role_object')],
+            },
+        ),
+        migrations.RunPython(backfill_identities, migrations.RunPython.noop),
+    ]
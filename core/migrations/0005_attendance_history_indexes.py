@@ -0,0 +1,29 @@
+# Generated by Django 6.0 on 2026-10-18 04:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0004_loginidentity'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='fees',
+            index=models.Index(fields=['student', '-created_at'], name='fees_student_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='student',
+            index=models.Index(fields=['student_class', '-created_at'], name='student_class_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='studentattendance',
+            index=models.Index(fields=['date', 'status'], name='student_att_date_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='teacherattendance',
+            index=models.Index(fields=['date', 'status'], name='teacher_att_date_status_idx'),
+        ),
+    ]
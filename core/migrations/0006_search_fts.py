@@ -0,0 +1,94 @@
+# Generated by Django 6.0 on 2026-10-18 06:12
+
+from django.db import OperationalError, migrations
+
+
+# The FTS5 tables and triggers as core.search defined them when this
+# migration was written; later changes go in new migrations
+CREATE_SQL = [
+    """CREATE VIRTUAL TABLE IF NOT EXISTS core_student_fts USING fts5(
+        name, surname, admission_no, roll_no, email,
+        content='core_student', content_rowid='id',
+        tokenize="unicode61 remove_diacritics 2 tokenchars '-'", prefix='2 3'
+    )""",
+    """CREATE TRIGGER IF NOT EXISTS core_student_fts_ai AFTER INSERT ON core_student BEGIN
+        INSERT INTO core_student_fts(rowid, name, surname, admission_no, roll_no, email)
+        VALUES (new.id, new.name, new.surname, new.admission_no, new.roll_no, new.email);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS core_student_fts_ad AFTER DELETE ON core_student BEGIN
+        INSERT INTO core_student_fts(core_student_fts, rowid, name, surname, admission_no, roll_no, email)
+        VALUES ('delete', old.id, old.name, old.surname, old.admission_no, old.roll_no, old.email);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS core_student_fts_au
+    AFTER UPDATE OF name, surname, admission_no, roll_no, email ON core_student BEGIN
+        INSERT INTO core_student_fts(core_student_fts, rowid, name, surname, admission_no, roll_no, email)
+        VALUES ('delete', old.id, old.name, old.surname, old.admission_no, old.roll_no, old.email);
+        INSERT INTO core_student_fts(rowid, name, surname, admission_no, roll_no, email)
+        VALUES (new.id, new.name, new.surname, new.admission_no, new.roll_no, new.email);
+    END""",
+    "INSERT INTO core_student_fts(core_student_fts) VALUES ('rebuild')",
+    """CREATE VIRTUAL TABLE IF NOT EXISTS core_teacher_fts USING fts5(
+        name, surname, employee_id, email,
+        content='core_teacher', content_rowid='id',
+        tokenize="unicode61 remove_diacritics 2 tokenchars '-'", prefix='2 3'
+    )""",
+    """CREATE TRIGGER IF NOT EXISTS core_teacher_fts_ai AFTER INSERT ON core_teacher BEGIN
+        INSERT INTO core_teacher_fts(rowid, name, surname, employee_id, email)
+        VALUES (new.id, new.name, new.surname, new.employee_id, new.email);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS core_teacher_fts_ad AFTER DELETE ON core_teacher BEGIN
+        INSERT INTO core_teacher_fts(core_teacher_fts, rowid, name, surname, employee_id, email)
+        VALUES ('delete', old.id, old.name, old.surname, old.employee_id, old.email);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS core_teacher_fts_au
+    AFTER UPDATE OF name, surname, employee_id, email ON core_teacher BEGIN
+        INSERT INTO core_teacher_fts(core_teacher_fts, rowid, name, surname, employee_id, email)
+        VALUES ('delete', old.id, old.name, old.surname, old.employee_id, old.email);
+        INSERT INTO core_teacher_fts(rowid, name, surname, employee_id, email)
+        VALUES (new.id, new.name, new.surname, new.employee_id, new.email);
+    END""",
+    "INSERT INTO core_teacher_fts(core_teacher_fts) VALUES ('rebuild')",
+]
+
+DROP_SQL = [
+    'DROP TRIGGER IF EXISTS core_student_fts_ai',
+    'DROP TRIGGER IF EXISTS core_student_fts_ad',
+    'DROP TRIGGER IF EXISTS core_student_fts_au',
+    'DROP TABLE IF EXISTS core_student_fts',
+    'DROP TRIGGER IF EXISTS core_teacher_fts_ai',
+    'DROP TRIGGER IF EXISTS core_teacher_fts_ad',
+    'DROP TRIGGER IF EXISTS core_teacher_fts_au',
+    'DROP TABLE IF EXISTS core_teacher_fts',
+]
+
+
+def create_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    with schema_editor.connection.cursor() as cursor:
+        try:
+            cursor.execute(CREATE_SQL[0])
+        except OperationalError:
+            # SQLite built without FTS5: search falls back to icontains
+            return
+        for statement in CREATE_SQL[1:]:
+            cursor.execute(statement)
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    with schema_editor.connection.cursor() as cursor:
+        for statement in DROP_SQL:
+            cursor.execute(statement)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0005_attendance_history_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
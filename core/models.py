@@ -1,6 +1,15 @@
+from functools import partial
+
 from django.db import models
 from django.contrib.auth.hashers import make_password, check_password
 
+from .hashers import rehash_password
+
+from .managers import (
+    StudentQuerySet, TeacherQuerySet, SubjectQuerySet, StudentAttendanceQuerySet,
+    TeacherAttendanceQuerySet, FeesQuerySet, SalaryQuerySet
+)
+
 
 class Class(models.Model):
     """Class/Grade model"""
@@ -27,12 +36,16 @@ class Subject(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = SubjectQuerySet.as_manager()
+
     def __str__(self):
         return f"{self.name} ({self.code})"
 
 
 class Teacher(models.Model):
     """Teacher model"""
+    LOGIN_ROLE = 'teacher'
+
     GENDER_CHOICES = [
         ('male', 'Male'),
         ('female', 'Female'),
@@ -57,11 +70,19 @@ class Teacher(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = TeacherQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['-created_at', '-id'], name='teacher_created_id_idx'),
+        ]
+
     def set_password(self, raw_password):
         self.password = make_password(raw_password)
 
     def check_password(self, raw_password):
-        return check_password(raw_password, self.password)
+        # Upgrades hashes made with an older algorithm or cost
+        return check_password(raw_password, self.password, setter=partial(upgrade_password, self))
 
     def __str__(self):
         return f"{self.name} {self.surname} ({self.employee_id})"
@@ -73,6 +94,8 @@ class Teacher(models.Model):
 
 class Student(models.Model):
     """Student model"""
+    LOGIN_ROLE = 'student'
+
     GENDER_CHOICES = [
         ('male', 'Male'),
         ('female', 'Female'),
@@ -99,11 +122,20 @@ class Student(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = StudentQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['-created_at', '-id'], name='student_created_id_idx'),
+            models.Index(fields=['student_class', '-created_at'], name='student_class_created_idx'),
+        ]
+
     def set_password(self, raw_password):
         self.password = make_password(raw_password)
 
     def check_password(self, raw_password):
-        return check_password(raw_password, self.password)
+        # Upgrades hashes made with an older algorithm or cost
+        return check_password(raw_password, self.password, setter=partial(upgrade_password, self))
 
     def __str__(self):
         return f"{self.name} {self.surname} ({self.admission_no})"
@@ -115,6 +147,8 @@ class Student(models.Model):
 
 class Admin(models.Model):
     """Admin model"""
+    LOGIN_ROLE = 'admin'
+
     username = models.CharField(max_length=50, unique=True)
     password = models.CharField(max_length=255)
     name = models.CharField(max_length=100)
@@ -127,7 +161,8 @@ class Admin(models.Model):
         self.password = make_password(raw_password)
 
     def check_password(self, raw_password):
-        return check_password(raw_password, self.password)
+        # Upgrades hashes made with an older algorithm or cost
+        return check_password(raw_password, self.password, setter=partial(upgrade_password, self))
 
     def __str__(self):
         return f"{self.name} {self.surname}"
@@ -152,9 +187,14 @@ class StudentAttendance(models.Model):
     remarks = models.TextField(blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    objects = StudentAttendanceQuerySet.as_manager()
+
     class Meta:
         unique_together = ['student', 'date']
         ordering = ['-date']
+        indexes = [
+            models.Index(fields=['date', 'status'], name='student_att_date_status_idx'),
+        ]
 
     def __str__(self):
         return f"{self.student} - {self.date} - {self.status}"
@@ -174,9 +214,14 @@ class TeacherAttendance(models.Model):
     remarks = models.TextField(blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    objects = TeacherAttendanceQuerySet.as_manager()
+
     class Meta:
         unique_together = ['teacher', 'date']
         ordering = ['-date']
+        indexes = [
+            models.Index(fields=['date', 'status'], name='teacher_att_date_status_idx'),
+        ]
 
     def __str__(self):
         return f"{self.teacher} - {self.date} - {self.status}"
@@ -201,8 +246,14 @@ class Fees(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = FeesQuerySet.as_manager()
+
     class Meta:
         verbose_name_plural = "Fees"
+        indexes = [
+            models.Index(fields=['-created_at', '-id'], name='fees_created_id_idx'),
+            models.Index(fields=['student', '-created_at'], name='fees_student_created_idx'),
+        ]
 
     def __str__(self):
         return f"{self.student} - {self.fee_type} - {self.status}"
@@ -224,9 +275,76 @@ class Salary(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = SalaryQuerySet.as_manager()
+
     class Meta:
         verbose_name_plural = "Salaries"
         unique_together = ['teacher', 'month']
+        indexes = [
+            models.Index(fields=['-created_at', '-id'], name='salary_created_id_idx'),
+        ]
 
     def __str__(self):
         return f"{self.teacher} - {self.month} - {self.status}"
+
+
+class AttendanceMonthlySummary(models.Model):
+    """Monthly attendance counts per student or teacher"""
+    student = models.ForeignKey(Student, on_delete=models.CASCADE, related_name='monthly_summaries', null=True, blank=True)
+    teacher = models.ForeignKey(Teacher, on_delete=models.CASCADE, related_name='monthly_summaries', null=True, blank=True)
+    month = models.DateField()  # first day of the month
+    present = models.IntegerField(default=0)
+    absent = models.IntegerField(default=0)
+    late = models.IntegerField(default=0)
+
+    class Meta:
+        verbose_name_plural = "Attendance monthly summaries"
+        constraints = [
+            models.UniqueConstraint(fields=['student', 'month'], name='unique_student_month_summary'),
+            models.UniqueConstraint(fields=['teacher', 'month'], name='unique_teacher_month_summary'),
+        ]
+
+    def __str__(self):
+        return f"{self.student or self.teacher} - {self.month:%B %Y}"
+
+
+class LoginIdentity(models.Model):
+    """Username and password hash of every Admin, Teacher and Student, for login"""
+    ROLE_CHOICES = [
+        ('admin', 'Admin'),
+        ('teacher', 'Teacher'),
+        ('student', 'Student'),
+    ]
+
+    username = models.CharField(max_length=50)
+    role = models.CharField(max_length=10, choices=ROLE_CHOICES)
+    object_id = models.BigIntegerField()  # pk of the Admin, Teacher or Student
+    password = models.CharField(max_length=255)
+    full_name = models.CharField(max_length=201)
+
+    class Meta:
+        verbose_name_plural = "Login identities"
+        constraints = [
+            models.UniqueConstraint(fields=['username', 'role'], name='unique_login_username_role'),
+            models.UniqueConstraint(fields=['role', 'object_id'], name='unique_login_role_object'),
+        ]
+
+    def check_password(self, raw_password):
+        return check_password(raw_password, self.password, setter=self.upgrade_password)
+
+    def upgrade_password(self, raw_password):
+        account = LOGIN_MODELS[self.role](pk=self.object_id)
+        upgrade_password(account, raw_password)
+        self.password = account.password
+
+    def __str__(self):
+        return f"{self.username} ({self.role})"
+
+
+LOGIN_MODELS = {'admin': Admin, 'teacher': Teacher, 'student': Student}
+
+
+def upgrade_password(account, raw_password):
+    """check_password setter: rehash with the current hasher on the account and its login identity"""
+    rehash_password(account, raw_password)
+    LoginIdentity.objects.filter(role=account.LOGIN_ROLE, object_id=account.pk).update(password=account.password)
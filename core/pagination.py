@@ -0,0 +1,116 @@
+"""
+Keyset (cursor) pagination for the admin list views.
+
+Pages are addressed by an opaque token holding the (created_at, id) of the
+row at the page boundary, so every page is a single indexed range query
+with no COUNT(*) and no OFFSET scan. The boundary is written as
+``created_at <= t AND (created_at < t OR id < pk)``: SQLite seeks the
+(created_at, id) index on the first term, while the equivalent
+``created_at < t OR (created_at = t AND id < pk)`` reads the whole index.
+"""
+import base64
+import binascii
+import json
+from datetime import datetime
+
+from django.conf import settings
+from django.core.paginator import Paginator
+from django.db.models import Q
+
+
+class CursorPage:
+    """One page of results with tokens for its neighbours"""
+    is_cursor = True
+
+    def __init__(self, object_list, next_cursor=None, previous_cursor=None):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+
+class CursorPaginator:
+    """Paginate a queryset newest first on (created_at, id)"""
+
+    def __init__(self, queryset, per_page):
+        self.queryset = queryset
+        self.per_page = per_page
+
+    @staticmethod
+    def encode_cursor(direction, obj):
+        payload = json.dumps([direction, obj.created_at.isoformat(), obj.pk], separators=(',', ':'))
+        return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+    @staticmethod
+    def decode_cursor(token):
+        """Return (direction, created_at, pk), or None for a missing or bad token"""
+        if not token:
+            return None
+        try:
+            padded = token + '=' * (-len(token) % 4)
+            direction, created_at, pk = json.loads(base64.urlsafe_b64decode(padded))
+            if direction not in ('n', 'p'):
+                return None
+            return direction, datetime.fromisoformat(created_at), int(pk)
+        except (binascii.Error, ValueError, TypeError):
+            return None
+
+    def page_queryset(self, cursor):
+        """Rows from the decoded ``cursor`` on, in reading order for its direction, one past a page"""
+        limit = self.per_page + 1
+        if cursor is None:
+            return self.queryset.order_by('-created_at', '-id')[:limit]
+        direction, created_at, pk = cursor
+        if direction == 'n':
+            after = Q(created_at__lte=created_at) & (Q(created_at__lt=created_at) | Q(id__lt=pk))
+            return self.queryset.filter(after).order_by('-created_at', '-id')[:limit]
+        before = Q(created_at__gte=created_at) & (Q(created_at__gt=created_at) | Q(id__gt=pk))
+        return self.queryset.filter(before).order_by('created_at', 'id')[:limit]
+
+    def get_page(self, token):
+        cursor = self.decode_cursor(token)
+        rows = list(self.page_queryset(cursor))
+
+        if cursor is None:
+            has_more, has_before = len(rows) > self.per_page, False
+        elif cursor[0] == 'n':
+            has_more, has_before = len(rows) > self.per_page, True
+        else:
+            has_before = len(rows) > self.per_page
+            rows = rows[:self.per_page][::-1]
+            has_more = True
+
+        rows = rows[:self.per_page]
+        if not rows:
+            return CursorPage([])
+        return CursorPage(
+            rows,
+            next_cursor=self.encode_cursor('n', rows[-1]) if has_more else None,
+            previous_cursor=self.encode_cursor('p', rows[0]) if has_before else None,
+        )
+
+
+def paginate(request, queryset, per_page=10):
+    """
+    Paginate a list view according to settings.LIST_PAGINATION.
+
+    'cursor' (the default) uses keyset pagination on ?cursor=, 'offset'
+    falls back to Django's numbered Paginator on ?page=.
+    """
+    if getattr(settings, 'LIST_PAGINATION', 'cursor') == 'offset':
+        return Paginator(queryset.order_by('-created_at', '-id'), per_page).get_page(request.GET.get('page'))
+    return CursorPaginator(queryset, per_page).get_page(request.GET.get('cursor'))
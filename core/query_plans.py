@@ -0,0 +1,51 @@
+"""
+The hot attendance, student and list-page queries whose plans must use an index.
+
+Checked by core.tests and the check_query_plans command.
+"""
+from .attendance import month_bounds
+from .models import Student, StudentAttendance, TeacherAttendance, Fees
+from .pagination import CursorPaginator
+
+
+def uses_index(plan, table):
+    """True unless the plan reads all of ``table`` or one of its indexes (SCAN instead of SEARCH)"""
+    return not any(f'SCAN {table}' in line for line in plan.splitlines())
+
+
+def hot_queries():
+    """(label, model, queryset) for each hot query, sampled from the latest rows; None without rows"""
+    sample = StudentAttendance.objects.order_by('-date').values_list(
+        'date', 'student_id', 'student__student_class_id').first()
+    teacher_id = TeacherAttendance.objects.order_by('-date').values_list('teacher_id', flat=True).first()
+    # The boundary of a fees_list page from the middle of the table
+    middle = Fees.objects.order_by('-created_at', '-id').values_list('created_at', 'id')[Fees.objects.count() // 2:][:1]
+    middle = middle[0] if middle else None
+    if sample is None or teacher_id is None or middle is None:
+        return None
+    latest, student_id, class_id = sample
+    start, end = month_bounds(latest)
+    paginator = CursorPaginator(Fees.objects.for_list(), 10)
+
+    return [
+        ('student_attendance_history', StudentAttendance,
+         StudentAttendance.objects.filter(student_id=student_id, date__gte=start, date__lt=end).order_by('date')),
+        ('teacher_attendance_history', TeacherAttendance,
+         TeacherAttendance.objects.filter(teacher_id=teacher_id, date__gte=start, date__lt=end).order_by('date')),
+        ('student_attendance_list', StudentAttendance,
+         StudentAttendance.objects.for_list().filter(date=latest)),
+        ('student_attendance_list (class)', StudentAttendance,
+         StudentAttendance.objects.for_list().filter(date=latest, student__student_class_id=class_id)),
+        ('teacher_attendance_list', TeacherAttendance,
+         TeacherAttendance.objects.for_list().filter(date=latest)),
+        ('present today', StudentAttendance,
+         StudentAttendance.objects.filter(date=latest, status='present')),
+        ('students of a class', Student,
+         Student.objects.for_list().filter(student_class_id=class_id).order_by('-created_at')),
+        ('student fees', Fees,
+         Fees.objects.filter(student_id=student_id).order_by('-created_at')),
+        ('fees_list next page', Fees,
+         paginator.page_queryset(('n', *middle))),
+        ('fees_list previous page', Fees,
+         paginator.page_queryset(('p', *middle))),
+    ]
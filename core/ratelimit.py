@@ -0,0 +1,93 @@
+"""
+Token-bucket rate limiting for login and attendance marking.
+
+Each (scope, key) pair has a bucket of RATELIMITS[scope] tokens, e.g.
+'10/m' holds 10 tokens and refills 10 per minute. A request takes one
+token; an empty bucket answers 429 before the view runs, so no query or
+password hash is spent on it. Login is limited per client IP and per
+username; attendance marking per signed-in user, so a whole school
+marking at once behind one proxy address does not share a bucket. Buckets live in the
+'ratelimit' cache when configured, else the default cache. Use a cache
+shared between workers (RATELIMIT_CACHE_BACKEND=file) or each worker
+keeps its own buckets. Buckets are read and written without a lock, so
+concurrent requests may slightly overshoot a limit.
+"""
+import hashlib
+import math
+import time
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import caches
+from django.http import HttpResponse
+
+
+PERIODS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+
+
+def parse_rate(rate):
+    """'10/m' -> (10, 60): bucket size and seconds to refill it"""
+    count, period = rate.split('/')
+    return int(count), PERIODS[period]
+
+
+def _store():
+    return caches['ratelimit' if 'ratelimit' in settings.CACHES else 'default']
+
+
+def client_ip(request):
+    """Client address, read from X-Forwarded-For behind RATELIMIT_PROXY_COUNT proxies"""
+    proxies = getattr(settings, 'RATELIMIT_PROXY_COUNT', 1)
+    forwarded = request.META.get('HTTP_X_FORWARDED_FOR')
+    if proxies and forwarded:
+        hops = [hop.strip() for hop in forwarded.split(',')]
+        return hops[-min(proxies, len(hops))]
+    return request.META.get('REMOTE_ADDR', '')
+
+
+def login_username(request):
+    return request.POST.get('username', '').strip().lower()
+
+
+def session_user(request):
+    """Role and id of the signed-in user; the decorator must sit inside the auth decorator"""
+    user_id = request.session.get('user_id')
+    if user_id is None:
+        return ''
+    return f"{request.session.get('user_role')}:{user_id}"
+
+
+def take_token(scope, key, rate):
+    """(allowed, seconds until a token is available)"""
+    capacity, period = parse_rate(rate)
+    digest = hashlib.sha1(key.encode()).hexdigest()
+    cache_key = f'ratelimit:{scope}:{digest}'
+    store = _store()
+    now = time.time()
+
+    tokens, stamp = store.get(cache_key) or (capacity, now)
+    tokens = min(capacity, tokens + (now - stamp) * capacity / period)
+    if tokens < 1:
+        return False, (1 - tokens) * period / capacity
+    store.set(cache_key, (tokens - 1, now), math.ceil(period))
+    return True, 0
+
+
+def ratelimit(scope, key_func=client_ip, methods=('POST',)):
+    """Answer 429 once ``key_func(request)`` has used up the RATELIMITS[scope] bucket"""
+    def decorator(view_func):
+        @wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            rate = getattr(settings, 'RATELIMITS', {}).get(scope)
+            if rate and request.method in methods and getattr(settings, 'RATELIMIT_ENABLED', True):
+                key = key_func(request)
+                if key:
+                    allowed, retry_after = take_token(scope, key, rate)
+                    if not allowed:
+                        response = HttpResponse('Too many requests. Please try again later.',
+                                                status=429, content_type='text/plain')
+                        response['Retry-After'] = str(math.ceil(retry_after))
+                        return response
+            return view_func(request, *args, **kwargs)
+        return wrapper
+    return decorator
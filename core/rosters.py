@@ -0,0 +1,107 @@
+"""
+Cached class rosters for the attendance marking pages.
+
+A roster is the list of (pk, roll_no, name, surname, class_id) tuples for
+one class; the marking pages show none until a class is picked, as the
+whole school would be thousands of rows on every request. The class
+dropdown is a list of (pk, label) tuples. Both live in Django's cache
+under keys carrying version numbers, so invalidating means bumping a
+version rather than finding and deleting keys: signal handlers in
+core.signals bump the classes a saved or deleted student belonged to, and
+bulk writers bump the global version. Old entries simply stop being read
+and expire after ROSTER_CACHE_TTL, which also bounds drift between workers
+that each keep their own local-memory cache.
+"""
+import time
+from collections import namedtuple
+from functools import partial
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from .models import Class, Student
+
+
+KEY_PREFIX = 'roster:'
+
+# Version names: every roster, the class dropdown
+ALL_VERSIONS = '*'
+CLASSES = 'classes'
+
+
+class ClassOption(namedtuple('ClassOption', 'pk label')):
+    __slots__ = ()
+
+    def __str__(self):
+        return self.label
+
+
+class RosterEntry(namedtuple('RosterEntry', 'pk roll_no name surname student_class')):
+    __slots__ = ()
+
+    @property
+    def full_name(self):
+        return f"{self.name} {self.surname}"
+
+
+def _ttl():
+    return getattr(settings, 'ROSTER_CACHE_TTL', 300)
+
+
+def _version_key(name):
+    return f'{KEY_PREFIX}v:{name}'
+
+
+def _versions(*names):
+    keys = [_version_key(name) for name in names]
+    cached = cache.get_many(keys)
+    return ':'.join(str(cached.get(key, 0)) for key in keys)
+
+
+def _bump(*names):
+    # Clock-based rather than incr, so a version that was evicted and
+    # recreated can never land on a number an old entry was stored under
+    version = time.time_ns()
+    cache.set_many({_version_key(name): version for name in names}, None)
+
+
+def get_class_options():
+    """Every class as (pk, label), in the model's ordering"""
+    key = f'{KEY_PREFIX}{CLASSES}:{_versions(ALL_VERSIONS, CLASSES)}'
+    options = cache.get(key)
+    if options is None:
+        options = [(cls.pk, str(cls)) for cls in Class.objects.only('name', 'section')]
+        cache.set(key, options, _ttl())
+    return [ClassOption(*option) for option in options]
+
+
+def get_roster(class_id, classes=None):
+    """Students of ``class_id`` ordered by pk, each with its class label"""
+    name = str(class_id)
+    key = f'{KEY_PREFIX}{name}:{_versions(ALL_VERSIONS, name)}'
+    rows = cache.get(key)
+    if rows is None:
+        students = Student.objects.filter(student_class_id=class_id).order_by('pk')
+        rows = list(students.values_list('pk', 'roll_no', 'name', 'surname', 'student_class_id'))
+        cache.set(key, rows, _ttl())
+
+    labels = {option.pk: option.label for option in (classes if classes is not None else get_class_options())}
+    return [RosterEntry(pk, roll_no, name, surname, labels.get(class_pk))
+            for pk, roll_no, name, surname, class_pk in rows]
+
+
+def invalidate_roster(*class_ids):
+    """Drop the rosters of these classes once the transaction commits"""
+    names = [str(class_id) for class_id in class_ids if class_id]
+    if names:
+        transaction.on_commit(partial(_bump, *names))
+
+
+def invalidate_class_options():
+    transaction.on_commit(partial(_bump, CLASSES))
+
+
+def invalidate_rosters():
+    """Forget every roster and the class dropdown, e.g. after bulk_create or raw SQL bypassed signals"""
+    transaction.on_commit(partial(_bump, ALL_VERSIONS))
@@ -0,0 +1,175 @@
+"""
+Full-text search over students and teachers (SQLite FTS5).
+
+Each model has an external-content FTS5 table reading its text columns
+from the model's own table, kept in step by AFTER INSERT/UPDATE/DELETE
+triggers, so bulk_create, raw SQL and the seeder are covered as well as
+ordinary saves. Every word of a query is matched as a prefix and results
+are ranked with bm25 across all matches, names weighted above codes and
+emails. Hyphens are part of a token, so an admission number or employee
+ID is one term.
+
+Ranking scores every match, and a one or two letter prefix matches a
+large share of the school (over 200k students it took 30-70 ms), so
+words shorter than MIN_PREFIX are matched as whole words only.
+
+SQLite drops a table's triggers when a migration rebuilds the table, so
+after every migrate the triggers are recreated and the index rebuilt if
+any is missing. Other database backends, or a SQLite build without
+FTS5, fall back to icontains filters.
+"""
+import re
+
+from django.db import OperationalError, connections, router
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+
+from .models import Student, Teacher
+
+
+# model: (indexed columns, bm25 weight of each column)
+INDEXES = {
+    Student: (('name', 'surname', 'admission_no', 'roll_no', 'email'), (10.0, 10.0, 5.0, 2.0, 1.0)),
+    Teacher: (('name', 'surname', 'employee_id', 'email'), (10.0, 10.0, 5.0, 1.0)),
+}
+
+# Words of a query that are used; the rest is ignored
+MAX_TERMS = 8
+
+# Shortest word of a query matched as a prefix
+MIN_PREFIX = 3
+
+TERM_RE = re.compile(r'\w[\w-]*')
+
+
+def fts_table(model):
+    return f'{model._meta.db_table}_fts'
+
+
+def _index_sql(model):
+    """Statements creating the FTS table and its triggers for ``model``"""
+    table, fts = model._meta.db_table, fts_table(model)
+    columns = INDEXES[model][0]
+    names = ', '.join(columns)
+    new = ', '.join(f'new.{column}' for column in columns)
+    old = ', '.join(f'old.{column}' for column in columns)
+    return [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5({names}, content='{table}', content_rowid='id', "
+        f"tokenize=\"unicode61 remove_diacritics 2 tokenchars '-'\", prefix='2 3')",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {table} BEGIN "
+        f"INSERT INTO {fts}(rowid, {names}) VALUES (new.id, {new}); END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {names}) VALUES ('delete', old.id, {old}); END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE OF {names} ON {table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {names}) VALUES ('delete', old.id, {old}); "
+        f"INSERT INTO {fts}(rowid, {names}) VALUES (new.id, {new}); END",
+    ]
+
+
+def _triggers(model):
+    fts = fts_table(model)
+    return {f'{fts}_ai', f'{fts}_ad', f'{fts}_au'}
+
+
+def create_search_index(connection):
+    """Create any missing FTS table or trigger and rebuild the index if something was missing"""
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT name FROM sqlite_master WHERE type IN ('table', 'trigger')")
+        existing = {row[0] for row in cursor.fetchall()}
+        for model in INDEXES:
+            if model._meta.db_table not in existing:
+                continue
+            if fts_table(model) in existing and _triggers(model) <= existing:
+                continue
+            try:
+                for statement in _index_sql(model):
+                    cursor.execute(statement)
+            except OperationalError:
+                # SQLite built without FTS5: search falls back to icontains
+                return
+            fts = fts_table(model)
+            cursor.execute(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")
+
+
+def drop_search_index(connection):
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        for model in INDEXES:
+            for trigger in sorted(_triggers(model)):
+                cursor.execute(f'DROP TRIGGER IF EXISTS {trigger}')
+            cursor.execute(f'DROP TABLE IF EXISTS {fts_table(model)}')
+
+
+def match_expression(query):
+    """FTS5 MATCH string treating every word of ``query`` as a prefix, or '' for none"""
+    terms = TERM_RE.findall(query.lower())[:MAX_TERMS]
+    return ' '.join(f'"{term}"*' if len(term) >= MIN_PREFIX else f'"{term}"' for term in terms)
+
+
+def _has_index(connection, model):
+    if connection.vendor != 'sqlite':
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = %s", [fts_table(model)])
+        return cursor.fetchone() is not None
+
+
+def _fallback_filter(model, query):
+    q = Q()
+    for term in TERM_RE.findall(query)[:MAX_TERMS]:
+        q &= Q(*[Q(**{f'{column}__icontains': term}) for column in INDEXES[model][0]], _connector=Q.OR)
+    return q
+
+
+def search_ids(model, query, limit=50):
+    """
+    Primary keys of ``model`` rows matching ``query``, best match first;
+    ``limit=None`` returns them all.
+
+    Returns None when full-text search is unavailable, so callers can
+    fall back to icontains filters.
+    """
+    match = match_expression(query)
+    if not match:
+        return []
+    connection = connections[router.db_for_read(model)]
+    if connection.vendor != 'sqlite':
+        return None
+    fts = fts_table(model)
+    weights = ', '.join(str(weight) for weight in INDEXES[model][1])
+    sql = f'SELECT rowid FROM {fts} WHERE {fts} MATCH %s ORDER BY bm25({fts}, {weights})'
+    params = [match]
+    if limit is not None:
+        sql += ' LIMIT %s'
+        params.append(limit)
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            return [row[0] for row in cursor.fetchall()]
+    except OperationalError:
+        return None
+
+
+def search(queryset, query, limit=50):
+    """Up to ``limit`` objects of ``queryset`` matching ``query``, best match first"""
+    ids = search_ids(queryset.model, query, limit)
+    if ids is None:
+        return list(queryset.filter(_fallback_filter(queryset.model, query))[:limit])
+    objects = queryset.in_bulk(ids)
+    return [objects[pk] for pk in ids if pk in objects]
+
+
+def search_queryset(queryset, query):
+    """``queryset`` narrowed to every row matching ``query``, in the queryset's own order"""
+    model = queryset.model
+    match = match_expression(query)
+    if not match:
+        return queryset.none()
+    if not _has_index(connections[queryset.db], model):
+        return queryset.filter(_fallback_filter(model, query))
+    # A subquery rather than a list of ids, which could pass SQLite's variable limit
+    fts = fts_table(model)
+    return queryset.filter(pk__in=RawSQL(f'SELECT rowid FROM {fts} WHERE {fts} MATCH %s', [match]))
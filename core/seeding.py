@@ -0,0 +1,299 @@
+"""
+Synthetic school data for load and performance testing.
+
+Everything is derived from one random seed and the ``end`` date, so the
+same options (including --end) always produce the same rows: timestamps
+are drawn from the seed around the dates being seeded rather than read
+from the clock, and password salts come from the seed. Accounts are
+created on their admission or joining date and fees shortly before they
+fall due, each at its own time of day, so created_at orders the rows the
+way real data would and keyset pagination does not tie on it. Accounts,
+fees and salary go through bulk_create; attendance, which dominates the
+volume, is written with executemany on a raw cursor. Signal-maintained
+state (login identities, monthly attendance rollup, dashboard counters)
+is rebuilt once at the end.
+"""
+import random
+import string
+import time
+from datetime import datetime, time as clock_time, timedelta
+from decimal import Decimal
+
+from django.conf import settings
+from django.contrib.auth.hashers import UNUSABLE_PASSWORD_PREFIX, make_password
+from django.db import connection, transaction
+from django.utils import timezone
+
+from .attendance import rebuild_monthly_summaries
+from .auth import sync_login_identities
+from .counters import invalidate_dashboard_counters
+from .models import Class, Subject, Teacher, Student, StudentAttendance, TeacherAttendance, Fees, Salary
+from .rosters import invalidate_rosters
+
+
+FIRST_NAMES = ['Aarav', 'Diya', 'Ishaan', 'Ananya', 'Kabir', 'Meera', 'Rohan', 'Saanvi', 'Vihaan', 'Zara',
+               'Arjun', 'Kiara', 'Reyansh', 'Myra', 'Aditya', 'Navya', 'Dhruv', 'Riya', 'Krish', 'Tara']
+SURNAMES = ['Patel', 'Shah', 'Mehta', 'Desai', 'Joshi', 'Iyer', 'Nair', 'Reddy', 'Gupta', 'Singh',
+            'Kumar', 'Rao', 'Savaliya', 'Trivedi', 'Pandya', 'Bhatt', 'Verma', 'Chopra', 'Malhotra', 'Das']
+SUBJECTS = ['Mathematics', 'Science', 'English', 'Social Studies', 'Computer']
+QUALIFICATIONS = ['B.Ed', 'M.Sc, B.Ed', 'M.A, B.Ed', 'Ph.D', 'M.Com']
+FEE_TYPES = ['Tuition', 'Exam', 'Library']
+GENDERS = ['male', 'female']
+
+# Seeded timestamps fall within the school day
+SCHOOL_OPENS = clock_time(9)
+SCHOOL_DAY_SECONDS = 8 * 3600
+SALT_CHARS = string.ascii_letters + string.digits
+
+
+class SchoolSeeder:
+    """Generate classes, subjects, teachers, students, attendance, fees and salary"""
+
+    def __init__(self, students=1000, teachers=50, classes=12, days=30, seed=0, end=None,
+                 prefix='seed', password='password', skip_passwords=False, batch_size=10000, log=None):
+        self.students = students
+        self.teachers = max(1, teachers)
+        self.classes = max(1, classes)
+        self.days = days
+        self.rng = random.Random(seed)
+        self.end = end or timezone.localdate()
+        self.prefix = prefix
+        self.password = password
+        self.skip_passwords = skip_passwords
+        self.batch_size = batch_size
+        self.log = log or (lambda message: None)
+        self.counts = {}
+
+    def run(self):
+        with transaction.atomic():
+            self.step('classes', self.create_classes)
+            self.step('subjects', self.create_subjects)
+            self.step('teachers', self.create_teachers)
+            self.step('students', self.create_students)
+            self.step('student attendance', self.create_student_attendance)
+            self.step('teacher attendance', self.create_teacher_attendance)
+            self.step('fees', self.create_fees)
+            self.step('salary', self.create_salary)
+            self.step('monthly summaries', self.rebuild_summaries)
+            invalidate_dashboard_counters()
+            invalidate_rosters()
+        return self.counts
+
+    def step(self, name, func):
+        start = time.perf_counter()
+        self.counts[name] = func()
+        self.log(f'{name}: {self.counts[name]} rows in {time.perf_counter() - start:.1f}s')
+
+    def school_days(self):
+        """The last ``days`` days up to ``end``, skipping Sundays, oldest first"""
+        days, day = [], self.end
+        while len(days) < self.days:
+            if day.weekday() != 6:
+                days.append(day)
+            day -= timedelta(days=1)
+        return days[::-1]
+
+    def timestamp(self, day):
+        """When school opened on ``day``, the created_at of rows seeded for it"""
+        value = datetime.combine(day, SCHOOL_OPENS)
+        return timezone.make_aware(value) if settings.USE_TZ else value
+
+    def moment(self, day):
+        """A seeded time during the school day on ``day``, or on ``end`` if ``day`` is later"""
+        offset = timedelta(seconds=self.rng.randrange(SCHOOL_DAY_SECONDS), microseconds=self.rng.randrange(10 ** 6))
+        return self.timestamp(min(day, self.end)) + offset
+
+    def restamp(self, model, rows):
+        """Replace the wall-clock created_at/updated_at that bulk_create wrote; ``rows`` are (pk, day) pairs"""
+        columns = [
+            connection.ops.quote_name(field.column) for field in model._meta.concrete_fields
+            if field.name in ('created_at', 'updated_at')
+        ]
+        sql = 'UPDATE {} SET {} WHERE id = %s'.format(
+            connection.ops.quote_name(model._meta.db_table), ', '.join(f'{column} = %s' for column in columns),
+        )
+        params = []
+        for pk, day in rows:
+            stamp = connection.ops.adapt_datetimefield_value(self.moment(day))
+            params.append([stamp] * len(columns) + [pk])
+        with connection.cursor() as cursor:
+            cursor.executemany(sql, params)
+
+    def school_day_stamps(self):
+        """(day, created_at) for each school day, created_at as the raw inserts store it"""
+        return [(day, connection.ops.adapt_datetimefield_value(self.timestamp(day))) for day in self.school_days()]
+
+    def person(self, index):
+        return self.rng.choice(FIRST_NAMES), self.rng.choice(SURNAMES), GENDERS[index % 2]
+
+    def password_hash(self):
+        # One hash shared by every seeded account unless hashing is skipped
+        if self.skip_passwords:
+            return UNUSABLE_PASSWORD_PREFIX + ''.join(self.rng.choice(SALT_CHARS) for _ in range(40))
+        return make_password(self.password, salt=''.join(self.rng.choice(SALT_CHARS) for _ in range(22)))
+
+    def create_classes(self):
+        sections = 'ABCDEFGH'
+        self.class_objs = Class.objects.bulk_create([
+            Class(name=f'Class {i % 12 + 1}', section=sections[i // 12 % len(sections)])
+            for i in range(self.classes)
+        ])
+        # Classes and subjects are set up over the years before the seeded period
+        self.restamp(Class, [(cls.pk, self.end - timedelta(days=self.rng.randrange(365, 3650)))
+                             for cls in self.class_objs])
+        return len(self.class_objs)
+
+    def create_subjects(self):
+        subjects = Subject.objects.bulk_create(
+            [
+                Subject(name=name, code=f'{self.prefix.upper()}-{c}-{name[:3].upper()}', class_assigned=cls)
+                for c, cls in enumerate(self.class_objs)
+                for name in SUBJECTS
+            ],
+            batch_size=self.batch_size,
+        )
+        self.subject_ids = [subject.pk for subject in subjects]
+        self.restamp(Subject, [(pk, self.end - timedelta(days=self.rng.randrange(365, 3650))) for pk in self.subject_ids])
+        return len(subjects)
+
+    def create_teachers(self):
+        password = self.password_hash()
+        teachers = []
+        for i in range(self.teachers):
+            name, surname, gender = self.person(i)
+            teachers.append(Teacher(
+                username=f'{self.prefix}-t{i}', password=password, name=name, surname=surname,
+                email=f'{self.prefix}-t{i}@example.com', mobile=f'9{self.rng.randrange(10 ** 9):09d}',
+                gender=gender, employee_id=f'{self.prefix.upper()}-T{i:05d}',
+                qualification=self.rng.choice(QUALIFICATIONS), joining_date=self.end - timedelta(days=self.rng.randrange(3650)),
+                experience=f'{self.rng.randrange(1, 25)} years', salary=Decimal(self.rng.randrange(25, 90) * 1000),
+            ))
+        self.teacher_objs = Teacher.objects.bulk_create(teachers, batch_size=self.batch_size)
+        self.restamp(Teacher, [(teacher.pk, teacher.joining_date) for teacher in self.teacher_objs])
+        sync_login_identities(self.teacher_objs)
+
+        through = Teacher.subjects.through
+        through.objects.bulk_create(
+            [
+                through(teacher_id=teacher.pk, subject_id=self.subject_ids[(i * 2 + k) % len(self.subject_ids)])
+                for i, teacher in enumerate(self.teacher_objs)
+                for k in range(2)
+            ],
+            batch_size=self.batch_size,
+            ignore_conflicts=True,
+        )
+        return len(self.teacher_objs)
+
+    def create_students(self):
+        password = self.password_hash()
+        self.student_rows = []  # (pk, class index)
+        created = 0
+        for start in range(0, self.students, self.batch_size):
+            batch = []
+            for i in range(start, min(start + self.batch_size, self.students)):
+                name, surname, gender = self.person(i)
+                c = i % len(self.class_objs)
+                batch.append(Student(
+                    username=f'{self.prefix}-s{i}', password=password, name=name, surname=surname,
+                    email=f'{self.prefix}-s{i}@example.com', mobile=f'9{self.rng.randrange(10 ** 9):09d}',
+                    gender=gender, roll_no=str(i // len(self.class_objs) + 1), student_class=self.class_objs[c],
+                    section=self.class_objs[c].section, admission_no=f'{self.prefix.upper()}-S{i:07d}',
+                    admission_date=self.end - timedelta(days=self.rng.randrange(2000)),
+                    parent_name=f'{self.rng.choice(FIRST_NAMES)} {surname}',
+                    parent_mobile=f'9{self.rng.randrange(10 ** 9):09d}',
+                ))
+            Student.objects.bulk_create(batch)
+            self.restamp(Student, [(student.pk, student.admission_date) for student in batch])
+            sync_login_identities(batch)
+            self.student_rows.extend((student.pk, i % len(self.class_objs)) for i, student in
+                                     enumerate(batch, start))
+            created += len(batch)
+        return created
+
+    def status(self):
+        roll = self.rng.random()
+        return 'present' if roll < 0.85 else 'absent' if roll < 0.95 else 'late'
+
+    def create_student_attendance(self):
+        class_teachers = [self.teacher_objs[c % len(self.teacher_objs)].pk for c in range(len(self.class_objs))]
+        rows = (
+            (pk, day, self.status(), '', created_at, class_teachers[c])
+            for day, created_at in self.school_day_stamps()
+            for pk, c in self.student_rows
+        )
+        return self.insert(StudentAttendance, ['student_id', 'date', 'status', 'remarks', 'created_at', 'marked_by_id'], rows)
+
+    def create_teacher_attendance(self):
+        rows = (
+            (teacher.pk, day, self.status(), '', created_at)
+            for day, created_at in self.school_day_stamps()
+            for teacher in self.teacher_objs
+        )
+        return self.insert(TeacherAttendance, ['teacher_id', 'date', 'status', 'remarks', 'created_at'], rows)
+
+    def insert(self, model, columns, rows):
+        """executemany in batches; returns the number of rows written"""
+        sql = 'INSERT INTO {} ({}) VALUES ({})'.format(
+            connection.ops.quote_name(model._meta.db_table),
+            ', '.join(connection.ops.quote_name(column) for column in columns),
+            ', '.join(['%s'] * len(columns)),
+        )
+        written, batch = 0, []
+        with connection.cursor() as cursor:
+            for row in rows:
+                batch.append(row)
+                if len(batch) >= self.batch_size:
+                    cursor.executemany(sql, batch)
+                    written += len(batch)
+                    batch = []
+            if batch:
+                cursor.executemany(sql, batch)
+                written += len(batch)
+        return written
+
+    def create_fees(self):
+        fees = []
+        written = 0
+        for pk, _ in self.student_rows:
+            for k, fee_type in enumerate(FEE_TYPES):
+                amount = Decimal(self.rng.randrange(5, 50) * 100)
+                due = self.end - timedelta(days=30 * k + self.rng.randrange(30))
+                roll = self.rng.random()
+                if roll < 0.6:
+                    status, paid, paid_date = 'paid', amount, due
+                elif roll < 0.8:
+                    status, paid, paid_date = 'partial', amount / 2, due
+                else:
+                    status, paid, paid_date = 'unpaid', Decimal(0), None
+                fees.append(Fees(student_id=pk, fee_type=fee_type, amount=amount, due_date=due,
+                                 paid_date=paid_date, paid_amount=paid, status=status))
+            if len(fees) >= self.batch_size:
+                written += self.write_fees(fees)
+                fees = []
+        if fees:
+            written += self.write_fees(fees)
+        return written
+
+    def write_fees(self, fees):
+        Fees.objects.bulk_create(fees)
+        # Raised up to a month before they fall due
+        self.restamp(Fees, [(fee.pk, fee.due_date - timedelta(days=self.rng.randrange(30))) for fee in fees])
+        return len(fees)
+
+    def create_salary(self):
+        months = sorted({day.replace(day=1) for day in self.school_days()})
+        salaries = [
+            Salary(teacher=teacher, month=f'{month:%B %Y}', amount=teacher.salary,
+                   paid_date=month + timedelta(days=27) if month + timedelta(days=27) <= self.end else None,
+                   status='paid' if month + timedelta(days=27) <= self.end else 'unpaid')
+            for teacher in self.teacher_objs
+            for month in months
+        ]
+        Salary.objects.bulk_create(salaries, batch_size=self.batch_size)
+        # Raised in the first days of their month
+        self.restamp(Salary, [(salary.pk, datetime.strptime(salary.month, '%B %Y').date() + timedelta(days=self.rng.randrange(5)))
+                              for salary in salaries])
+        return len(salaries)
+
+    def rebuild_summaries(self):
+        return sum(rebuild_monthly_summaries(person) for person in ('student', 'teacher'))
@@ -0,0 +1,87 @@
+"""
+Cache-first session engine (SESSION_ENGINE = 'core.sessions').
+
+Built on Django's cached_db engine: sessions are read from the cache and
+fall back to the database, and saves write through to both. On top of
+that, assigning a value a key already holds does not mark the session
+modified, and a session whose data is unchanged since it was loaded is
+not written at all. The three role keys are stored under one-letter
+names to keep the signed payload small; sessions written by the stock
+engines still load.
+
+The cache must be shared by every worker (CACHE_BACKEND=file or a
+SESSION_CACHE_ALIAS pointing at a shared cache). With per-process local
+memory a worker can serve a session another worker has since changed.
+"""
+from django.contrib.sessions.backends.cached_db import SessionStore as CachedDBStore
+from django.core.signing import JSONSerializer
+
+
+COMPACT_KEYS = {
+    'user_id': '~u',
+    'user_role': '~r',
+    'user_name': '~n',
+}
+EXPANDED_KEYS = {short: key for key, short in COMPACT_KEYS.items()}
+
+
+class CompactJSONSerializer(JSONSerializer):
+    """JSON with the role keys renamed to short ones"""
+
+    def dumps(self, obj):
+        return super().dumps({COMPACT_KEYS.get(key, key): value for key, value in obj.items()})
+
+    def loads(self, data):
+        return {EXPANDED_KEYS.get(key, key): value for key, value in super().loads(data).items()}
+
+
+class SessionStore(CachedDBStore):
+    cache_key_prefix = 'core.sessions'
+
+    def __init__(self, session_key=None):
+        super().__init__(session_key)
+        self.serializer = CompactJSONSerializer
+        self._loaded = None
+
+    def __setitem__(self, key, value):
+        session = self._session
+        if key in session and session[key] == value:
+            return
+        session[key] = value
+        self.modified = True
+
+    async def aset(self, key, value):
+        session = await self._aget_session()
+        if key in session and session[key] == value:
+            return
+        session[key] = value
+        self.modified = True
+
+    def _snapshot(self, data):
+        # Serialized, so values mutated in place still count as changes
+        return self.serializer().dumps(data)
+
+    def load(self):
+        data = super().load()
+        self._loaded = self._snapshot(data)
+        return data
+
+    async def aload(self):
+        data = await super().aload()
+        self._loaded = self._snapshot(data)
+        return data
+
+    def save(self, must_create=False):
+        snapshot = self._snapshot(self._session)
+        if not must_create and self.session_key and snapshot == self._loaded:
+            # Marked modified but holding what was loaded: nothing to write
+            return
+        super().save(must_create)
+        self._loaded = snapshot
+
+    async def asave(self, must_create=False):
+        snapshot = self._snapshot(await self._aget_session())
+        if not must_create and self.session_key and snapshot == self._loaded:
+            return
+        await super().asave(must_create)
+        self._loaded = snapshot
@@ -0,0 +1,194 @@
+"""
+Model signal handlers for the core app.
+"""
+from django.db import connections, transaction
+from django.db.models import DEFERRED
+from django.db.models.signals import post_init, post_migrate, post_save, post_delete
+from django.dispatch import receiver
+
+from .attendance import month_bounds, refresh_monthly_summary
+from .auth import forget_default_admin, remove_login_identity, sync_login_identities
+from .counters import adjust_counter, invalidate_recent
+from .dashboards import invalidate_dashboard, invalidate_dashboards
+from .models import Admin, Student, Teacher, Class, Subject, StudentAttendance, TeacherAttendance, Fees
+from .rosters import invalidate_class_options, invalidate_roster, invalidate_rosters
+from .search import create_search_index
+
+
+# ==================== ATTENDANCE ROLLUP ====================
+
+# Attendance model: (field naming the person, person model)
+ROLLUP_PEOPLE = {
+    StudentAttendance: ('student', Student),
+    TeacherAttendance: ('teacher', Teacher),
+}
+
+
+@receiver(post_init, sender=StudentAttendance)
+@receiver(post_init, sender=TeacherAttendance)
+def attendance_loaded(sender, instance, **kwargs):
+    # Remember the person and date the row was loaded with, so moving it
+    # to another person or month also recounts the month it left
+    person_field = ROLLUP_PEOPLE[sender][0]
+    instance._loaded_rollup_key = (
+        instance.__dict__.get(f'{person_field}_id', DEFERRED), instance.__dict__.get('date', DEFERRED),
+    )
+
+
+@receiver(post_save, sender=StudentAttendance)
+@receiver(post_save, sender=TeacherAttendance)
+def attendance_saved(sender, instance, raw=False, **kwargs):
+    """Keep the monthly rollup in step with single-row saves (e.g. Django admin)"""
+    if raw:
+        return
+    person_field = ROLLUP_PEOPLE[sender][0]
+    person_id, day = getattr(instance, f'{person_field}_id'), instance.date
+    refresh_monthly_summary(person_field, person_id, day)
+
+    loaded_person_id, loaded_day = loaded = instance._loaded_rollup_key
+    if None not in loaded and DEFERRED not in loaded:
+        if (loaded_person_id, month_bounds(loaded_day)) != (person_id, month_bounds(day)):
+            refresh_monthly_summary(person_field, loaded_person_id, loaded_day, create=False)
+    instance._loaded_rollup_key = (person_id, day)
+
+
+@receiver(post_delete, sender=StudentAttendance)
+@receiver(post_delete, sender=TeacherAttendance)
+def attendance_deleted(sender, instance, origin=None, **kwargs):
+    person_field, person_model = ROLLUP_PEOPLE[sender]
+    # Deleting the person cascades to their summaries as well
+    if isinstance(origin, person_model):
+        return
+    refresh_monthly_summary(person_field, getattr(instance, f'{person_field}_id'), instance.date, create=False)
+
+
+# ==================== DASHBOARD COUNTERS ====================
+
+@receiver(post_save, sender=Student)
+@receiver(post_save, sender=Teacher)
+@receiver(post_save, sender=Class)
+@receiver(post_save, sender=Subject)
+def dashboard_model_saved(sender, instance, created=False, raw=False, **kwargs):
+    if raw:
+        return
+    if created:
+        adjust_counter(sender, 1)
+    if sender is Teacher:
+        invalidate_recent('recent_teachers')
+    else:
+        # Student rows show their class name
+        invalidate_recent('recent_students')
+
+
+@receiver(post_delete, sender=Student)
+@receiver(post_delete, sender=Teacher)
+@receiver(post_delete, sender=Class)
+@receiver(post_delete, sender=Subject)
+def dashboard_model_deleted(sender, instance, **kwargs):
+    adjust_counter(sender, -1)
+    invalidate_recent('recent_teachers' if sender is Teacher else 'recent_students')
+
+
+# ==================== DASHBOARD PAGES ====================
+
+@receiver(post_save, sender=StudentAttendance)
+@receiver(post_delete, sender=StudentAttendance)
+@receiver(post_save, sender=Fees)
+@receiver(post_delete, sender=Fees)
+def student_data_changed(sender, instance, **kwargs):
+    invalidate_dashboard('student', instance.student_id)
+
+
+@receiver(post_save, sender=TeacherAttendance)
+@receiver(post_delete, sender=TeacherAttendance)
+def teacher_data_changed(sender, instance, **kwargs):
+    invalidate_dashboard('teacher', instance.teacher_id)
+
+
+@receiver(post_save, sender=Student)
+@receiver(post_delete, sender=Student)
+@receiver(post_save, sender=Teacher)
+@receiver(post_delete, sender=Teacher)
+def profile_changed(sender, instance, **kwargs):
+    invalidate_dashboard(instance.LOGIN_ROLE, instance.pk)
+
+
+@receiver(post_save, sender=Class)
+@receiver(post_delete, sender=Class)
+def class_changed(sender, **kwargs):
+    # Student dashboards show the class name
+    invalidate_dashboards()
+
+
+# ==================== ATTENDANCE ROSTERS ====================
+
+@receiver(post_init, sender=Student)
+def student_loaded(sender, instance, **kwargs):
+    # Remember the class the row was loaded with; read from __dict__ so a
+    # deferred field is not fetched just for this
+    instance._loaded_class_id = instance.__dict__.get('student_class_id', DEFERRED)
+
+
+@receiver(post_save, sender=Student)
+def roster_student_saved(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    loaded, current = instance._loaded_class_id, instance.__dict__.get('student_class_id', DEFERRED)
+    if DEFERRED in (loaded, current):
+        invalidate_rosters()
+    else:
+        invalidate_roster(loaded, current)
+    instance._loaded_class_id = current
+
+
+@receiver(post_delete, sender=Student)
+def roster_student_deleted(sender, instance, **kwargs):
+    loaded = instance._loaded_class_id
+    if loaded is DEFERRED:
+        invalidate_rosters()
+    else:
+        invalidate_roster(loaded)
+
+
+@receiver(post_save, sender=Class)
+def roster_class_saved(sender, instance, raw=False, **kwargs):
+    if not raw:
+        invalidate_class_options()
+
+
+@receiver(post_delete, sender=Class)
+def roster_class_deleted(sender, instance, **kwargs):
+    # Its students were moved to no class with an UPDATE that sends no signals
+    invalidate_rosters()
+
+
+# ==================== AUTH ====================
+
+@receiver(post_save, sender=Admin)
+@receiver(post_delete, sender=Admin)
+def admin_changed(sender, **kwargs):
+    transaction.on_commit(forget_default_admin)
+
+
+@receiver(post_save, sender=Admin)
+@receiver(post_save, sender=Teacher)
+@receiver(post_save, sender=Student)
+def account_saved(sender, instance, **kwargs):
+    sync_login_identities([instance])
+
+
+@receiver(post_delete, sender=Admin)
+@receiver(post_delete, sender=Teacher)
+@receiver(post_delete, sender=Student)
+def account_deleted(sender, instance, **kwargs):
+    remove_login_identity(instance)
+
+
+# ==================== SEARCH INDEX ====================
+
+@receiver(post_migrate)
+def restore_search_index(sender, using, **kwargs):
+    # A migration that rebuilds core_student or core_teacher on SQLite
+    # drops the triggers keeping the full-text index in step
+    if sender.name == 'core':
+        create_search_index(connections[using])
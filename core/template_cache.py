@@ -0,0 +1,85 @@
+"""
+Compiled-template cache for the project templates.
+
+``Loader`` is Django's cached loader with hit and miss counters, which the
+admin metrics endpoint reports. ``warm_template_cache`` compiles every
+template under the project's template directories, partials included,
+so that with gunicorn --preload the master process parses them once and
+every forked worker starts with a full cache instead of paying for it on
+its first requests. wsgi.py and asgi.py call it at import time; set
+TEMPLATE_WARMUP=False to skip it.
+"""
+import logging
+import os
+import threading
+import time
+
+from django.conf import settings
+from django.template import TemplateSyntaxError, engines
+from django.template.backends.django import DjangoTemplates
+from django.template.loaders import cached
+
+
+logger = logging.getLogger(__name__)
+
+_stats = {'hits': 0, 'misses': 0, 'warmed': 0, 'warmup_ms': 0.0}
+_stats_lock = threading.Lock()
+
+
+class Loader(cached.Loader):
+    """Django's cached loader, counting cache hits and misses"""
+
+    def get_template(self, template_name, skip=None):
+        hit = self.cache_key(template_name, skip) in self.get_template_cache
+        with _stats_lock:
+            _stats['hits' if hit else 'misses'] += 1
+        return super().get_template(template_name, skip)
+
+
+def template_cache_stats():
+    """Hit/miss counts since warmup, plus what the warmup compiled"""
+    with _stats_lock:
+        stats = dict(_stats)
+    lookups = stats['hits'] + stats['misses']
+    stats['hit_rate'] = round(stats['hits'] / lookups, 4) if lookups else None
+    stats['warmup_ms'] = round(stats['warmup_ms'], 1)
+    return stats
+
+
+def project_template_names(engine):
+    """Names of the templates an engine can load from inside BASE_DIR"""
+    base = os.path.realpath(settings.BASE_DIR)
+    names = set()
+    for loader in engine.template_loaders:
+        for directory in loader.get_dirs():
+            directory = os.path.realpath(directory)
+            if os.path.commonpath([base, directory]) != base or not os.path.isdir(directory):
+                continue
+            for root, _, files in os.walk(directory):
+                for filename in files:
+                    if filename.endswith(('.html', '.txt', '.xml')):
+                        path = os.path.relpath(os.path.join(root, filename), directory)
+                        names.add(path.replace(os.sep, '/'))
+    return sorted(names)
+
+
+def warm_template_cache():
+    """Compile every project template into the cached loaders; returns how many"""
+    if not getattr(settings, 'TEMPLATE_WARMUP', True):
+        return 0
+    start = time.perf_counter()
+    warmed = 0
+    for backend in engines.all():
+        if not isinstance(backend, DjangoTemplates):
+            continue
+        for name in project_template_names(backend.engine):
+            try:
+                backend.engine.get_template(name)
+                warmed += 1
+            except TemplateSyntaxError:
+                # Left for the request that uses it to report
+                logger.exception('Template %s failed to compile during warmup', name)
+
+    with _stats_lock:
+        _stats.update(hits=0, misses=0, warmed=warmed, warmup_ms=(time.perf_counter() - start) * 1000)
+    return warmed
@@ -0,0 +1,162 @@
+from datetime import date
+
+from django.core.cache import cache, caches
+from django.core.cache.utils import make_template_fragment_key
+from django.db import connection
+from django.test import RequestFactory, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from .dashboards import KEY_PREFIX, _version
+from .middleware import QueryBudgetExceeded
+from .models import Fees, Salary, Student, Teacher
+from .query_plans import hot_queries, uses_index
+from .ratelimit import client_ip
+from .seeding import SchoolSeeder
+from .views import parse_history_month
+
+
+class QueryPlanTests(TestCase):
+    """The hot attendance and student queries are index searches, not table scans"""
+
+    @classmethod
+    def setUpTestData(cls):
+        SchoolSeeder(students=200, teachers=10, classes=4, days=10, end=date(2026, 3, 31),
+                     prefix='plan', skip_passwords=True).run()
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+
+    def test_hot_queries_use_indexes(self):
+        queries = hot_queries()
+        self.assertIsNotNone(queries)
+        for label, model, queryset in queries:
+            table = model._meta.db_table
+            plan = queryset.explain()
+            with self.subTest(label, plan=plan):
+                self.assertIn(f'SEARCH {table} USING', plan)
+                self.assertTrue(uses_index(plan, table))
+
+
+class HistoryMonthTests(TestCase):
+
+    def test_valid_month(self):
+        self.assertEqual(parse_history_month('2026-02'), date(2026, 2, 1))
+
+    def test_invalid_month_falls_back_to_current(self):
+        current = date.today().replace(day=1)
+        for value in (None, '', 'abc', '2026-13', '2026-00', '2026-2-1'):
+            with self.subTest(value):
+                self.assertEqual(parse_history_month(value), current)
+
+
+@override_settings(RATELIMITS={'attendance-mark': '2/m'}, RATELIMIT_PROXY_COUNT=1)
+class RateLimitTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        SchoolSeeder(students=10, teachers=2, classes=1, days=1, end=date(2026, 3, 31),
+                     prefix='limit', skip_passwords=True).run()
+
+    def setUp(self):
+        for cache in caches.all():
+            cache.clear()
+
+    def sign_in(self, teacher):
+        session = self.client.session
+        session.update({'user_id': teacher.pk, 'user_role': 'teacher', 'user_name': teacher.name})
+        session.save()
+
+    def test_client_ip_behind_proxy(self):
+        request = RequestFactory().get('/', REMOTE_ADDR='10.0.0.1', HTTP_X_FORWARDED_FOR='198.51.100.7')
+        self.assertEqual(client_ip(request), '198.51.100.7')
+
+    def test_attendance_mark_is_limited_per_user(self):
+        url = reverse('teacher_mark_student_attendance')
+        data = {'date': '2026-03-31'}
+        first, second = Teacher.objects.order_by('pk')[:2]
+
+        self.sign_in(first)
+        statuses = [self.client.post(url, data, REMOTE_ADDR='10.0.0.1').status_code for _ in range(3)]
+        self.assertEqual(statuses, [302, 302, 429])
+
+        # Same proxy address, another teacher: a separate bucket
+        self.sign_in(second)
+        self.assertEqual(self.client.post(url, data, REMOTE_ADDR='10.0.0.1').status_code, 302)
+
+
+class DashboardCacheTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        SchoolSeeder(students=2, teachers=1, classes=1, days=3, end=date(2026, 3, 31),
+                     prefix='dash', skip_passwords=True).run()
+
+    def setUp(self):
+        for store in caches.all():
+            store.clear()
+        self.student = Student.objects.order_by('pk').first()
+        session = self.client.session
+        session.update({'user_id': self.student.pk, 'user_role': 'student', 'user_name': self.student.name})
+        session.save()
+
+    def drop_page(self, response):
+        cache.delete(f"{KEY_PREFIX}student:{self.student.pk}:{response['ETag']}")
+
+    def test_cached_fragments_skip_queries(self):
+        url = reverse('student_dashboard')
+        self.drop_page(self.client.get(url))
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertContains(response, self.student.full_name)
+        self.assertFalse([q for q in queries if 'core_student' in q['sql'] or 'core_fees' in q['sql']])
+
+    def test_expired_fragments_are_rendered_with_data(self):
+        url = reverse('student_dashboard')
+        self.drop_page(self.client.get(url))
+        version = _version('student', self.student.pk)[0]
+        for fragment in ('header', 'body'):
+            cache.delete(make_template_fragment_key(f'student_dashboard_{fragment}', [self.student.pk, version]))
+        self.assertContains(self.client.get(url), self.student.full_name)
+
+
+@override_settings(QUERY_BUDGET_STRICT=True)
+class QueryBudgetTests(TestCase):
+    """The list and detail views stay within QUERY_BUDGETS with rows to show"""
+
+    @classmethod
+    def setUpTestData(cls):
+        SchoolSeeder(students=60, teachers=8, classes=3, days=5, end=date(2026, 3, 31),
+                     prefix='budget', skip_passwords=True).run()
+
+    def setUp(self):
+        for store in caches.all():
+            store.clear()
+        session = self.client.session
+        session.update({'user_id': 1, 'user_role': 'admin', 'user_name': 'Admin'})
+        session.save()
+
+    def budgeted_urls(self):
+        student, teacher = Student.objects.first(), Teacher.objects.first()
+        self.assertTrue(Fees.objects.exists() and Salary.objects.exists())
+        return [
+            reverse('admin_dashboard'),
+            reverse('student_list'),
+            reverse('teacher_list'),
+            reverse('fees_list'),
+            reverse('salary_list'),
+            reverse('subject_list'),
+            reverse('student_detail', args=[student.pk]),
+            reverse('teacher_detail', args=[teacher.pk]),
+            reverse('student_attendance_list') + '?date=2026-03-31',
+            reverse('teacher_attendance_list') + '?date=2026-03-31',
+        ]
+
+    def test_views_within_budget(self):
+        for url in self.budgeted_urls():
+            with self.subTest(url):
+                self.assertEqual(self.client.get(url).status_code, 200)
+
+    def test_view_over_budget_raises(self):
+        with override_settings(QUERY_BUDGETS={'student_list': 1}):
+            with self.assertRaises(QueryBudgetExceeded):
+                self.client.get(reverse('student_list'))
@@ -1,6 +1,7 @@
 from django.urls import path
 from . import views
 
+
 urlpatterns = [
     # Home & Auth
     path('', views.home, name='home'),
@@ -9,6 +10,9 @@ urlpatterns = [
     
     # Admin Dashboard
     path('admin-panel/', views.admin_dashboard, name='admin_dashboard'),
+    path('admin-panel/metrics/', views.query_metrics, name='query_metrics'),
+    path('admin-panel/search/', views.search_people, name='search_people'),
+    path('admin-panel/autocomplete/<slug:kind>/', views.autocomplete, name='autocomplete'),
     
     # Student Management
     path('admin-panel/students/', views.student_list, name='student_list'),
@@ -56,6 +60,12 @@ urlpatterns = [
     path('admin-panel/salary/<int:pk>/edit/', views.salary_edit, name='salary_edit'),
     path('admin-panel/salary/<int:pk>/delete/', views.salary_delete, name='salary_delete'),
     
+    # Exports
+    path('admin-panel/export/<slug:kind>/', views.export_data, name='export_data'),
+    
+    # Imports
+    path('admin-panel/import/', views.bulk_import, name='bulk_import'),
+    
     # Teacher Dashboard
     path('teacher/', views.teacher_dashboard, name='teacher_dashboard'),
     path('teacher/attendance/', views.teacher_attendance_history, name='teacher_attendance_history'),
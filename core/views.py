@@ -1,17 +1,32 @@
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib import messages
-from django.http import JsonResponse
+from django.http import JsonResponse, StreamingHttpResponse, HttpResponseBadRequest, Http404
 from django.db.models import Count, Sum
-from django.core.paginator import Paginator
+from django.conf import settings
+from django.urls import reverse
+from django.utils.functional import SimpleLazyObject
 from datetime import datetime, date, timedelta
+import io
 from .models import (
-    Student, Teacher, Class, Subject, Admin,
-    StudentAttendance, TeacherAttendance, Fees, Salary
+    Student, Teacher, Class, Subject,
+    StudentAttendance, TeacherAttendance, Fees, Salary, AttendanceMonthlySummary
 )
 from .forms import (
     LoginForm, StudentForm, TeacherForm, ClassForm, SubjectForm,
-    FeesForm, SalaryForm, StudentAttendanceForm, TeacherAttendanceForm
+    FeesForm, SalaryForm, StudentAttendanceForm, TeacherAttendanceForm, BulkImportForm
 )
+from .pagination import paginate
+from .search import search
+from .autocomplete import SOURCES as AUTOCOMPLETE_SOURCES, autocomplete_page
+from .middleware import metrics_summary
+from .counters import get_dashboard_counters
+from .dashboards import cached_dashboard
+from .rosters import get_class_options, get_roster
+from .ratelimit import ratelimit, login_username, session_user
+from .auth import admin_required, teacher_required, student_required, find_login_identity, login_session
+from .exports import EXPORTS, FORMATS, ExportError, export_filename, parse_date, stream_export
+from .imports import detect_format, import_file
+from .attendance import collect_statuses, mark_student_attendance, mark_teacher_attendance, month_bounds
 
 
 # ==================== HOME & AUTH ====================
@@ -21,6 +36,8 @@ def home(request):
     return render(request, 'home.html')
 
 
+@ratelimit('login-ip')
+@ratelimit('login-username', login_username)
 def login_view(request):
     """Unified login view for Admin, Teacher, and Student"""
     if request.method == 'POST':
@@ -29,48 +46,16 @@ def login_view(request):
             role = form.cleaned_data['role']
             username = form.cleaned_data['username']
             password = form.cleaned_data['password']
-            
-            if role == 'admin':
-                try:
-                    admin = Admin.objects.get(username=username)
-                    if admin.check_password(password):
-                        request.session['user_id'] = admin.id
-                        request.session['user_role'] = 'admin'
-                        request.session['user_name'] = admin.full_name
-                        messages.success(request, f'Welcome, {admin.full_name}!')
-                        return redirect('admin_dashboard')
-                    else:
-                        messages.error(request, 'Invalid password!')
-                except Admin.DoesNotExist:
-                    messages.error(request, 'Admin not found!')
-                    
-            elif role == 'teacher':
-                try:
-                    teacher = Teacher.objects.get(username=username)
-                    if teacher.check_password(password):
-                        request.session['user_id'] = teacher.id
-                        request.session['user_role'] = 'teacher'
-                        request.session['user_name'] = teacher.full_name
-                        messages.success(request, f'Welcome, {teacher.full_name}!')
-                        return redirect('teacher_dashboard')
-                    else:
-                        messages.error(request, 'Invalid password!')
-                except Teacher.DoesNotExist:
-                    messages.error(request, 'Teacher not found!')
-                    
-            elif role == 'student':
-                try:
-                    student = Student.objects.get(username=username)
-                    if student.check_password(password):
-                        request.session['user_id'] = student.id
-                        request.session['user_role'] = 'student'
-                        request.session['user_name'] = student.full_name
-                        messages.success(request, f'Welcome, {student.full_name}!')
-                        return redirect('student_dashboard')
-                    else:
-                        messages.error(request, 'Invalid password!')
-                except Student.DoesNotExist:
-                    messages.error(request, 'Student not found!')
+
+            identity = find_login_identity(role, username)
+            if identity is None:
+                messages.error(request, f'{role.title()} not found!')
+            elif identity.check_password(password):
+                login_session(request, identity.object_id, role, identity.full_name)
+                messages.success(request, f'Welcome, {identity.full_name}!')
+                return redirect(f'{role}_dashboard')
+            else:
+                messages.error(request, 'Invalid password!')
     else:
         form = LoginForm()
     
@@ -86,49 +71,75 @@ def logout_view(request):
 
 # ==================== ADMIN DASHBOARD ====================
 
-def admin_required(view_func):
-    """Decorator to check if user is admin - auto-login if not logged in"""
-    def wrapper(request, *args, **kwargs):
-        if request.session.get('user_role') != 'admin':
-            # Auto-login as admin for direct access
-            try:
-                admin = Admin.objects.first()
-                if admin:
-                    request.session['user_id'] = admin.id
-                    request.session['user_role'] = 'admin'
-                    request.session['user_name'] = admin.full_name
-            except:
-                messages.error(request, 'Admin not found.')
-                return redirect('login')
-        return view_func(request, *args, **kwargs)
-    return wrapper
-
-
 @admin_required
 def admin_dashboard(request):
     """Admin dashboard view"""
-    context = {
-        'total_teachers': Teacher.objects.count(),
-        'total_students': Student.objects.count(),
-        'total_classes': Class.objects.count(),
-        'total_subjects': Subject.objects.count(),
-        'recent_students': Student.objects.order_by('-created_at')[:5],
-        'recent_teachers': Teacher.objects.order_by('-created_at')[:5],
-        'user_name': request.session.get('user_name', 'Admin'),
-    }
+    context = get_dashboard_counters()
+    context['user_name'] = request.session.get('user_name', 'Admin')
     return render(request, 'admin/dashboard.html', context)
 
 
+@admin_required
+def search_people(request):
+    """Ranked student and teacher matches for ?q= as JSON"""
+    query = request.GET.get('q', '').strip()
+    kind = request.GET.get('kind', 'all')
+    if kind not in ('all', 'students', 'teachers'):
+        return HttpResponseBadRequest('kind must be all, students or teachers')
+    try:
+        limit = max(1, min(int(request.GET.get('limit', 10)), settings.SEARCH_RESULTS_LIMIT))
+    except ValueError:
+        return HttpResponseBadRequest('limit must be a number')
+
+    results = []
+    if query and kind in ('all', 'students'):
+        results += [
+            {'kind': 'student', 'id': student.pk, 'name': student.full_name, 'code': student.admission_no,
+             'url': reverse('student_detail', args=[student.pk])}
+            for student in search(Student.objects.only('name', 'surname', 'admission_no'), query, limit)
+        ]
+    if query and kind in ('all', 'teachers'):
+        results += [
+            {'kind': 'teacher', 'id': teacher.pk, 'name': teacher.full_name, 'code': teacher.employee_id,
+             'url': reverse('teacher_detail', args=[teacher.pk])}
+            for teacher in search(Teacher.objects.only('name', 'surname', 'employee_id'), query, limit)
+        ]
+    return JsonResponse({'query': query, 'results': results})
+
+
+@admin_required
+def autocomplete(request, kind):
+    """One page of choices for an AutocompleteSelect as JSON"""
+    if kind not in AUTOCOMPLETE_SOURCES:
+        raise Http404('Unknown autocomplete')
+    try:
+        cursor = max(0, int(request.GET.get('cursor') or 0))
+    except ValueError:
+        return HttpResponseBadRequest('cursor must be a number')
+    choices, next_cursor = autocomplete_page(kind, request.GET.get('q', '').strip(), cursor)
+    return JsonResponse({
+        'results': [{'id': pk, 'text': label} for pk, label in choices],
+        'next': next_cursor,
+    })
+
+
+@admin_required
+def query_metrics(request):
+    """Per-view query count and latency summary from the request ring buffer"""
+    return JsonResponse(metrics_summary())
+
+
 # ==================== STUDENT MANAGEMENT ====================
 
 @admin_required
 def student_list(request):
-    """View all students"""
-    students = Student.objects.all().order_by('-created_at')
-    paginator = Paginator(students, 10)
-    page = request.GET.get('page')
-    students = paginator.get_page(page)
-    return render(request, 'admin/students/list.html', {'students': students})
+    """View all students, or the best matches for ?q="""
+    query = request.GET.get('q', '').strip()
+    if query:
+        students = search(Student.objects.for_list(), query, settings.SEARCH_RESULTS_LIMIT)
+    else:
+        students = paginate(request, Student.objects.for_list())
+    return render(request, 'admin/students/list.html', {'students': students, 'query': query})
 
 
 @admin_required
@@ -171,8 +182,8 @@ def student_edit(request, pk):
 @admin_required
 def student_detail(request, pk):
     """View student details"""
-    student = get_object_or_404(Student, pk=pk)
-    attendances = StudentAttendance.objects.filter(student=student).order_by('-date')[:30]
+    student = get_object_or_404(Student.objects.for_detail(), pk=pk)
+    attendances = StudentAttendance.objects.for_student_detail().filter(student=student).order_by('-date')[:30]
     fees = Fees.objects.filter(student=student).order_by('-created_at')
     return render(request, 'admin/students/detail.html', {
         'student': student,
@@ -196,12 +207,13 @@ def student_delete(request, pk):
 
 @admin_required
 def teacher_list(request):
-    """View all teachers"""
-    teachers = Teacher.objects.all().order_by('-created_at')
-    paginator = Paginator(teachers, 10)
-    page = request.GET.get('page')
-    teachers = paginator.get_page(page)
-    return render(request, 'admin/teachers/list.html', {'teachers': teachers})
+    """View all teachers, or the best matches for ?q="""
+    query = request.GET.get('q', '').strip()
+    if query:
+        teachers = search(Teacher.objects.for_list(), query, settings.SEARCH_RESULTS_LIMIT)
+    else:
+        teachers = paginate(request, Teacher.objects.for_list())
+    return render(request, 'admin/teachers/list.html', {'teachers': teachers, 'query': query})
 
 
 @admin_required
@@ -244,7 +256,7 @@ def teacher_edit(request, pk):
 @admin_required
 def teacher_detail(request, pk):
     """View teacher details"""
-    teacher = get_object_or_404(Teacher, pk=pk)
+    teacher = get_object_or_404(Teacher.objects.for_detail(), pk=pk)
     attendances = TeacherAttendance.objects.filter(teacher=teacher).order_by('-date')[:30]
     salaries = Salary.objects.filter(teacher=teacher).order_by('-created_at')
     return render(request, 'admin/teachers/detail.html', {
@@ -319,7 +331,7 @@ def class_delete(request, pk):
 @admin_required
 def subject_list(request):
     """View all subjects"""
-    subjects = Subject.objects.all().order_by('name')
+    subjects = Subject.objects.for_list().order_by('name')
     return render(request, 'admin/subjects/list.html', {'subjects': subjects})
 
 
@@ -365,17 +377,42 @@ def subject_delete(request, pk):
 
 # ==================== ATTENDANCE MANAGEMENT ====================
 
+def parse_attendance_date(value):
+    """Parse the posted YYYY-MM-DD attendance date, None if invalid"""
+    try:
+        return date.fromisoformat(value or '')
+    except ValueError:
+        return None
+
+
+def parse_history_month(value):
+    """Parse a ?month=YYYY-MM filter, falling back to the current month if invalid"""
+    try:
+        year, month = map(int, (value or '').split('-'))
+        return date(year, month, 1)
+    except ValueError:
+        return date.today().replace(day=1)
+
+
+def attendance_summary(result):
+    """Human readable counts for a bulk attendance write"""
+    summary = f'{result.inserted} added, {result.updated} updated.'
+    if result.skipped:
+        summary += f' {result.skipped} skipped.'
+    return summary
+
+
 @admin_required
 def student_attendance_list(request):
     """View student attendance"""
     selected_date = request.GET.get('date', date.today().isoformat())
     selected_class = request.GET.get('class', '')
     
-    attendances = StudentAttendance.objects.filter(date=selected_date)
+    attendances = StudentAttendance.objects.for_list().filter(date=selected_date)
     if selected_class:
         attendances = attendances.filter(student__student_class_id=selected_class)
     
-    classes = Class.objects.all()
+    classes = get_class_options()
     return render(request, 'admin/attendance/student_list.html', {
         'attendances': attendances,
         'classes': classes,
@@ -385,29 +422,28 @@ def student_attendance_list(request):
 
 
 @admin_required
+@ratelimit('attendance-mark', session_user)
 def student_attendance_mark(request):
     """Mark student attendance"""
     selected_date = request.GET.get('date', date.today().isoformat())
     selected_class = request.GET.get('class', '')
     
     if request.method == 'POST':
-        attendance_date = request.POST.get('date')
-        for key, value in request.POST.items():
-            if key.startswith('status_'):
-                student_id = key.replace('status_', '')
-                StudentAttendance.objects.update_or_create(
-                    student_id=student_id,
-                    date=attendance_date,
-                    defaults={'status': value}
-                )
-        messages.success(request, 'Attendance marked successfully!')
+        attendance_date = parse_attendance_date(request.POST.get('date'))
+        if attendance_date is None:
+            messages.error(request, 'Invalid attendance date!')
+            return redirect('student_attendance_mark')
+        result = mark_student_attendance(
+            attendance_date,
+            collect_statuses(request.POST),
+            class_id=selected_class if selected_class.isdigit() else None
+        )
+        messages.success(request, f'Attendance marked successfully! {attendance_summary(result)}')
         return redirect('student_attendance_list')
     
-    students = Student.objects.all()
-    if selected_class:
-        students = students.filter(student_class_id=selected_class)
-    
-    classes = Class.objects.all()
+    classes = get_class_options()
+    # Nothing until a class is picked: the whole school is thousands of rows
+    students = get_roster(selected_class, classes) if selected_class.isdigit() else []
     return render(request, 'admin/attendance/student_mark.html', {
         'students': students,
         'classes': classes,
@@ -420,7 +456,7 @@ def student_attendance_mark(request):
 def teacher_attendance_list(request):
     """View teacher attendance"""
     selected_date = request.GET.get('date', date.today().isoformat())
-    attendances = TeacherAttendance.objects.filter(date=selected_date)
+    attendances = TeacherAttendance.objects.for_list().filter(date=selected_date)
     return render(request, 'admin/attendance/teacher_list.html', {
         'attendances': attendances,
         'selected_date': selected_date
@@ -428,21 +464,18 @@ def teacher_attendance_list(request):
 
 
 @admin_required
+@ratelimit('attendance-mark', session_user)
 def teacher_attendance_mark(request):
     """Mark teacher attendance"""
     selected_date = request.GET.get('date', date.today().isoformat())
     
     if request.method == 'POST':
-        attendance_date = request.POST.get('date')
-        for key, value in request.POST.items():
-            if key.startswith('status_'):
-                teacher_id = key.replace('status_', '')
-                TeacherAttendance.objects.update_or_create(
-                    teacher_id=teacher_id,
-                    date=attendance_date,
-                    defaults={'status': value}
-                )
-        messages.success(request, 'Teacher attendance marked successfully!')
+        attendance_date = parse_attendance_date(request.POST.get('date'))
+        if attendance_date is None:
+            messages.error(request, 'Invalid attendance date!')
+            return redirect('teacher_attendance_mark')
+        result = mark_teacher_attendance(attendance_date, collect_statuses(request.POST))
+        messages.success(request, f'Teacher attendance marked successfully! {attendance_summary(result)}')
         return redirect('teacher_attendance_list')
     
     teachers = Teacher.objects.all()
@@ -457,10 +490,7 @@ def teacher_attendance_mark(request):
 @admin_required
 def fees_list(request):
     """View all fees"""
-    fees = Fees.objects.all().order_by('-created_at')
-    paginator = Paginator(fees, 10)
-    page = request.GET.get('page')
-    fees = paginator.get_page(page)
+    fees = paginate(request, Fees.objects.for_list())
     return render(request, 'admin/fees/list.html', {'fees': fees})
 
 
@@ -509,10 +539,7 @@ def fees_delete(request, pk):
 @admin_required
 def salary_list(request):
     """View all salaries"""
-    salaries = Salary.objects.all().order_by('-created_at')
-    paginator = Paginator(salaries, 10)
-    page = request.GET.get('page')
-    salaries = paginator.get_page(page)
+    salaries = paginate(request, Salary.objects.for_list())
     return render(request, 'admin/salary/list.html', {'salaries': salaries})
 
 
@@ -556,47 +583,90 @@ def salary_delete(request, pk):
     return render(request, 'admin/salary/delete.html', {'salary': salary})
 
 
+# ==================== EXPORTS ====================
+
+@admin_required
+def export_data(request, kind):
+    """Stream students, attendance, fees or salary as CSV or JSONL"""
+    if kind not in EXPORTS:
+        raise Http404('Unknown export')
+    fmt = request.GET.get('format', 'csv')
+    compress = request.GET.get('gzip') == '1'
+    try:
+        chunks = stream_export(
+            kind,
+            fmt,
+            date_from=parse_date(request.GET.get('from')),
+            date_to=parse_date(request.GET.get('to')),
+            class_id=request.GET.get('class'),
+            compress=compress,
+        )
+    except ExportError as e:
+        return HttpResponseBadRequest(str(e))
+
+    response = StreamingHttpResponse(
+        chunks, content_type='application/gzip' if compress else FORMATS[fmt]
+    )
+    response['Content-Disposition'] = f'attachment; filename="{export_filename(kind, fmt, compress)}"'
+    return response
+
+
+# ==================== IMPORTS ====================
+
+@admin_required
+def bulk_import(request):
+    """Import students or teachers from an uploaded CSV or JSONL file"""
+    result = None
+    if request.method == 'POST':
+        form = BulkImportForm(request.POST, request.FILES)
+        if form.is_valid():
+            upload = form.cleaned_data['file']
+            dry_run = form.cleaned_data['dry_run']
+            stream = io.TextIOWrapper(upload.file, encoding='utf-8-sig', newline='')
+            try:
+                result = import_file(form.cleaned_data['kind'], stream, detect_format(upload.name), dry_run=dry_run,
+                                     workers=settings.BULK_IMPORT_WEB_WORKERS)
+            except UnicodeDecodeError:
+                messages.error(request, 'The file must be UTF-8 encoded.')
+            else:
+                verb = 'would be imported' if dry_run else 'imported'
+                if result.created:
+                    messages.success(request, f'{result.created} {form.cleaned_data["kind"]} {verb}.')
+                if result.errors:
+                    messages.error(request, f'{len(result.errors)} rows were skipped.')
+    else:
+        form = BulkImportForm()
+    return render(request, 'admin/import/form.html', {'form': form, 'result': result})
+
+
 # ==================== TEACHER DASHBOARD ====================
 
-def teacher_required(view_func):
-    """Decorator to check if user is teacher"""
-    def wrapper(request, *args, **kwargs):
-        if request.session.get('user_role') != 'teacher':
-            messages.error(request, 'You must be logged in as teacher to access this page.')
-            return redirect('login')
-        return view_func(request, *args, **kwargs)
-    return wrapper
+def this_month_summary(**person):
+    """This month's attendance rollup of one student or teacher, or an empty one"""
+    month_start = date.today().replace(day=1)
+    summary = AttendanceMonthlySummary.objects.filter(month=month_start, **person).first()
+    return summary or AttendanceMonthlySummary(month=month_start)
 
 
 @teacher_required
 def teacher_dashboard(request):
     """Teacher dashboard view"""
     teacher_id = request.session.get('user_id')
-    teacher = get_object_or_404(Teacher, pk=teacher_id)
-    
-    # Get attendance stats
-    today = date.today()
-    month_start = today.replace(day=1)
-    
-    monthly_attendance = TeacherAttendance.objects.filter(
-        teacher=teacher,
-        date__gte=month_start,
-        date__lte=today
-    )
     
-    present_count = monthly_attendance.filter(status='present').count()
-    absent_count = monthly_attendance.filter(status='absent').count()
-    late_count = monthly_attendance.filter(status='late').count()
+    def render_page(context):
+        # Lazy, so only the fragments missing from the cache query
+        summary = SimpleLazyObject(lambda: this_month_summary(teacher_id=teacher_id))
+        context.update({
+            'user_name': request.session.get('user_name', 'Teacher'),
+            'teacher': SimpleLazyObject(lambda: get_object_or_404(Teacher, pk=teacher_id)),
+            'present_count': lambda: summary.present,
+            'absent_count': lambda: summary.absent,
+            'late_count': lambda: summary.late,
+            'recent_attendance': TeacherAttendance.objects.filter(teacher_id=teacher_id).order_by('-date')[:10],
+        })
+        return render(request, 'teacher/dashboard.html', context)
     
-    context = {
-        'teacher': teacher,
-        'present_count': present_count,
-        'absent_count': absent_count,
-        'late_count': late_count,
-        'recent_attendance': TeacherAttendance.objects.filter(teacher=teacher).order_by('-date')[:10],
-        'user_name': request.session.get('user_name', 'Teacher'),
-    }
-    return render(request, 'teacher/dashboard.html', context)
+    return cached_dashboard(request, 'teacher', teacher_id, render_page)
 
 
 @teacher_required
@@ -605,23 +675,24 @@ def teacher_attendance_history(request):
     teacher_id = request.session.get('user_id')
     teacher = get_object_or_404(Teacher, pk=teacher_id)
     
-    month = request.GET.get('month', date.today().strftime('%Y-%m'))
-    year, month_num = map(int, month.split('-'))
+    start, end = month_bounds(parse_history_month(request.GET.get('month')))
     
+    # Half-open range so the (teacher, date) index is used
     attendances = TeacherAttendance.objects.filter(
         teacher=teacher,
-        date__year=year,
-        date__month=month_num
+        date__gte=start,
+        date__lt=end
     ).order_by('date')
     
     return render(request, 'teacher/attendance_history.html', {
         'teacher': teacher,
         'attendances': attendances,
-        'selected_month': month
+        'selected_month': start.strftime('%Y-%m')
     })
 
 
 @teacher_required
+@ratelimit('attendance-mark', session_user)
 def teacher_mark_student_attendance(request):
     """Teacher marks student attendance"""
     selected_date = request.GET.get('date', date.today().isoformat())
@@ -631,23 +702,22 @@ def teacher_mark_student_attendance(request):
     teacher = get_object_or_404(Teacher, pk=teacher_id)
     
     if request.method == 'POST':
-        attendance_date = request.POST.get('date')
-        for key, value in request.POST.items():
-            if key.startswith('status_'):
-                student_id = key.replace('status_', '')
-                StudentAttendance.objects.update_or_create(
-                    student_id=student_id,
-                    date=attendance_date,
-                    defaults={'status': value, 'marked_by': teacher}
-                )
-        messages.success(request, 'Student attendance marked successfully!')
+        attendance_date = parse_attendance_date(request.POST.get('date'))
+        if attendance_date is None:
+            messages.error(request, 'Invalid attendance date!')
+            return redirect('teacher_mark_student_attendance')
+        result = mark_student_attendance(
+            attendance_date,
+            collect_statuses(request.POST),
+            marked_by=teacher,
+            class_id=selected_class if selected_class.isdigit() else None
+        )
+        messages.success(request, f'Student attendance marked successfully! {attendance_summary(result)}')
         return redirect('teacher_mark_student_attendance')
     
-    students = Student.objects.all()
-    if selected_class:
-        students = students.filter(student_class_id=selected_class)
-    
-    classes = Class.objects.all()
+    classes = get_class_options()
+    # Nothing until a class is picked: the whole school is thousands of rows
+    students = get_roster(selected_class, classes) if selected_class.isdigit() else []
     return render(request, 'teacher/mark_attendance.html', {
         'students': students,
         'classes': classes,
@@ -658,49 +728,26 @@ def teacher_mark_student_attendance(request):
 
 # ==================== STUDENT DASHBOARD ====================
 
-def student_required(view_func):
-    """Decorator to check if user is student"""
-    def wrapper(request, *args, **kwargs):
-        if request.session.get('user_role') != 'student':
-            messages.error(request, 'You must be logged in as student to access this page.')
-            return redirect('login')
-        return view_func(request, *args, **kwargs)
-    return wrapper
-
-
 @student_required
 def student_dashboard(request):
     """Student dashboard view"""
     student_id = request.session.get('user_id')
-    student = get_object_or_404(Student, pk=student_id)
-    
-    # Get attendance stats
-    today = date.today()
-    month_start = today.replace(day=1)
     
-    monthly_attendance = StudentAttendance.objects.filter(
-        student=student,
-        date__gte=month_start,
-        date__lte=today
-    )
+    def render_page(context):
+        # Lazy, so only the fragments missing from the cache query
+        summary = SimpleLazyObject(lambda: this_month_summary(student_id=student_id))
+        context.update({
+            'user_name': request.session.get('user_name', 'Student'),
+            'student': SimpleLazyObject(lambda: get_object_or_404(Student.objects.for_detail(), pk=student_id)),
+            'present_count': lambda: summary.present,
+            'absent_count': lambda: summary.absent,
+            'late_count': lambda: summary.late,
+            'recent_attendance': StudentAttendance.objects.filter(student_id=student_id).order_by('-date')[:10],
+            'pending_fees': Fees.objects.filter(student_id=student_id, status='unpaid'),
+        })
+        return render(request, 'student/dashboard.html', context)
     
-    present_count = monthly_attendance.filter(status='present').count()
-    absent_count = monthly_attendance.filter(status='absent').count()
-    late_count = monthly_attendance.filter(status='late').count()
-    
-    # Get fees
-    pending_fees = Fees.objects.filter(student=student, status='unpaid')
-    
-    context = {
-        'student': student,
-        'present_count': present_count,
-        'absent_count': absent_count,
-        'late_count': late_count,
-        'recent_attendance': StudentAttendance.objects.filter(student=student).order_by('-date')[:10],
-        'pending_fees': pending_fees,
-        'user_name': request.session.get('user_name', 'Student'),
-    }
-    return render(request, 'student/dashboard.html', context)
+    return cached_dashboard(request, 'student', student_id, render_page)
 
 
 @student_required
@@ -709,19 +756,19 @@ def student_attendance_history(request):
     student_id = request.session.get('user_id')
     student = get_object_or_404(Student, pk=student_id)
     
-    month = request.GET.get('month', date.today().strftime('%Y-%m'))
-    year, month_num = map(int, month.split('-'))
+    start, end = month_bounds(parse_history_month(request.GET.get('month')))
     
-    attendances = StudentAttendance.objects.filter(
+    # Half-open range so the (student, date) index is used
+    attendances = StudentAttendance.objects.for_student_detail().filter(
         student=student,
-        date__year=year,
-        date__month=month_num
+        date__gte=start,
+        date__lt=end
     ).order_by('date')
     
     return render(request, 'student/attendance_history.html', {
         'student': student,
         'attendances': attendances,
-        'selected_month': month
+        'selected_month': start.strftime('%Y-%m')
     })
 
 
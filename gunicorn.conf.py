@@ -0,0 +1,80 @@
+"""
+Gunicorn production profile.
+
+Gunicorn reads this file from the working directory, so the Procfiles
+only name the application. Every value can be overridden from the
+environment:
+
+WEB_CONCURRENCY          worker processes (default: 2 per CPU + 1)
+GUNICORN_THREADS         threads per worker; above 1 uses gthread workers (default: 1)
+GUNICORN_MAX_REQUESTS    recycle a worker after this many requests (default: 1000, 0 disables)
+GUNICORN_MAX_REQUESTS_JITTER   random extra requests per worker, so they do not all restart at once
+GUNICORN_TIMEOUT         seconds before a silent worker is killed and replaced (default: 30)
+CACHE_BACKEND            defaults to file here, see below
+
+Rate limits, dashboard counters, attendance rosters and dashboard page
+versions all live in the default cache, so the workers must share it.
+The profile defaults CACHE_BACKEND to the file cache and refuses to
+start more than one worker with the per-process locmem cache.
+
+The app is preloaded in the master: Django, the URLconf and the compiled
+templates (core.template_cache) are imported once and shared with the
+workers copy-on-write. Database connections opened while preloading are
+closed before forking, so no two processes ever share a SQLite handle.
+"""
+import os
+import sys
+
+
+def cpu_count():
+    """CPUs this process may run on (respects container CPU pinning)"""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+bind = f"0.0.0.0:{os.getenv('PORT', '8000')}"
+
+workers = int(os.getenv('WEB_CONCURRENCY', cpu_count() * 2 + 1))
+threads = int(os.getenv('GUNICORN_THREADS', '1'))
+
+# Read by settings.py when the app is loaded, which happens after this file
+os.environ.setdefault('CACHE_BACKEND', 'file')
+
+preload_app = True
+
+max_requests = int(os.getenv('GUNICORN_MAX_REQUESTS', '1000'))
+max_requests_jitter = int(os.getenv('GUNICORN_MAX_REQUESTS_JITTER', str(max_requests // 10)))
+
+timeout = int(os.getenv('GUNICORN_TIMEOUT', '30'))
+graceful_timeout = 30
+keepalive = 5
+
+
+def on_starting(server):
+    # server.cfg.workers includes any --workers given on the command line
+    if server.cfg.workers > 1 and os.environ['CACHE_BACKEND'] == 'locmem':
+        server.log.error(
+            'CACHE_BACKEND=locmem gives each of the %d workers its own cache, so rate limits, counters '
+            'and cached pages would drift apart; use CACHE_BACKEND=file or a single worker.', server.cfg.workers,
+        )
+        sys.exit(1)
+
+
+def pre_fork(server, worker):
+    # Connections opened while preloading belong to the master only
+    from django.db import connections
+    connections.close_all()
+
+
+def post_fork(server, worker):
+    # Nothing should survive pre_fork, but a worker must never reuse a
+    # connection opened in another process
+    from django.db import connections
+    connections.close_all()
+
+
+def worker_exit(server, worker):
+    from django.db import connections
+    connections.close_all()
@@ -1,8 +1,17 @@
 """
 ASGI config for school_management project.
+
+Deploy with wsgi.py (Procfile): serving the same views through uvicorn
+workers measured about half the WSGI throughput (bench_asgi: 80-82 vs
+164-180 req/s with 1 worker and 10 concurrent requests).
 """
 import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'school_management.settings')
 application = get_asgi_application()
+
+# Compile every template now, so workers forked after --preload share them
+from core.template_cache import warm_template_cache  # noqa: E402
+
+warm_template_cache()
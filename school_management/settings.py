@@ -31,7 +31,9 @@ INSTALLED_APPS = [
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
+    'core.middleware.QueryMetricsMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
+    'core.middleware.ReplicaRoutingMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
@@ -45,8 +47,15 @@ TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
         'DIRS': [BASE_DIR / 'templates'],
-        'APP_DIRS': True,
         'OPTIONS': {
+            # Compiled templates are cached per process (with hit counters)
+            # and warmed at startup by core.template_cache
+            'loaders': [
+                ('core.template_cache.Loader', [
+                    'django.template.loaders.filesystem.Loader',
+                    'django.template.loaders.app_directories.Loader',
+                ]),
+            ],
             'context_processors': [
                 'django.template.context_processors.debug',
                 'django.template.context_processors.request',
@@ -59,13 +68,138 @@ TEMPLATES = [
 
 WSGI_APPLICATION = 'school_management.wsgi.application'
 
+# Compile every project template when wsgi.py/asgi.py is imported, i.e. in
+# the gunicorn master with --preload, before workers fork
+TEMPLATE_WARMUP = os.getenv('TEMPLATE_WARMUP', 'True') == 'True'
+
+# Serve with WSGI (Procfile). Under ASGI (asgi.py with uvicorn workers)
+# the dashboards and history pages measured about half the throughput:
+# bench_asgi with 1 worker and 10 concurrent requests gave 80-82 req/s
+# against 164-180 req/s for gunicorn sync workers. The async ORM runs a
+# request's queries one at a time on a single thread, so there is nothing
+# to overlap with local SQLite.
+
+# SQLite connection tuning, applied to every new connection via init_command.
+# WAL lets readers run while attendance is being written; NORMAL sync is
+# durable across application crashes in WAL mode.
+SQLITE_PRAGMAS = {
+    'journal_mode': os.getenv('SQLITE_JOURNAL_MODE', 'WAL'),
+    'synchronous': os.getenv('SQLITE_SYNCHRONOUS', 'NORMAL'),
+    'mmap_size': os.getenv('SQLITE_MMAP_SIZE', str(128 * 1024 * 1024)),
+    'cache_size': os.getenv('SQLITE_CACHE_SIZE', '-20000'),  # negative = KiB
+    'busy_timeout': os.getenv('SQLITE_BUSY_TIMEOUT', '5000'),  # milliseconds
+    'temp_store': os.getenv('SQLITE_TEMP_STORE', 'MEMORY'),
+}
+
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        'CONN_MAX_AGE': int(os.getenv('DB_CONN_MAX_AGE', '600')),
+        'CONN_HEALTH_CHECKS': True,
+        'OPTIONS': {
+            'init_command': ';'.join(f'PRAGMA {name}={value}' for name, value in SQLITE_PRAGMAS.items()),
+            # Take the write lock at BEGIN so concurrent writers wait on
+            # busy_timeout instead of failing with "database is locked"
+            'transaction_mode': os.getenv('SQLITE_TRANSACTION_MODE', 'IMMEDIATE'),
+        },
+    }
+}
+
+# Cache: per-process local memory by default; set CACHE_BACKEND=file to
+# share one cache between gunicorn workers (gunicorn.conf.py defaults to it)
+CACHE_BACKEND = os.getenv('CACHE_BACKEND', 'locmem')
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'school-management',
+    }
+}
+if CACHE_BACKEND == 'file':
+    CACHES['default'] = {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.getenv('CACHE_LOCATION', str(BASE_DIR / '.cache')),
+    }
+
+# Rate limiting (core.ratelimit). Buckets go to a 'ratelimit' cache when
+# RATELIMIT_CACHE_BACKEND=file so all workers share them.
+if os.getenv('RATELIMIT_CACHE_BACKEND') == 'file':
+    CACHES['ratelimit'] = {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.getenv('RATELIMIT_CACHE_LOCATION', str(BASE_DIR / '.cache' / 'ratelimit')),
     }
+RATELIMIT_ENABLED = os.getenv('RATELIMIT_ENABLED', 'True') == 'True'
+# Proxies in front of the app that append to X-Forwarded-For. Railway's
+# edge proxy is one; with 0 every client would share the proxy's address.
+# Set 0 only when clients connect directly.
+RATELIMIT_PROXY_COUNT = int(os.getenv('RATELIMIT_PROXY_COUNT', '1'))
+RATELIMITS = {
+    'login-ip': os.getenv('RATELIMIT_LOGIN_IP', '30/m'),
+    'login-username': os.getenv('RATELIMIT_LOGIN_USERNAME', '10/m'),
+    'attendance-mark': os.getenv('RATELIMIT_ATTENDANCE_MARK', '60/m'),
 }
 
+# Sessions: 'core.sessions' reads sessions from the cache (falling back to
+# the database) and skips writes when nothing changed. Only use it with a
+# cache every worker shares.
+SESSION_ENGINE = os.getenv('SESSION_ENGINE', 'django.contrib.sessions.backends.db')
+SESSION_CACHE_ALIAS = os.getenv('SESSION_CACHE_ALIAS', 'default')
+
+# Fallback expiry for the signal-maintained admin dashboard counters
+DASHBOARD_CACHE_TTL = int(os.getenv('DASHBOARD_CACHE_TTL', '300'))
+
+# Expiry of cached student/teacher dashboard pages, fragments and their
+# versions (core.dashboards); they are invalidated on write, this bounds
+# how long a worker with its own cache can miss another worker's write
+DASHBOARD_PAGE_CACHE_TTL = int(os.getenv('DASHBOARD_PAGE_CACHE_TTL', '3600'))
+
+# Expiry of cached attendance rosters and class dropdowns (core.rosters);
+# they are versioned and invalidated on write, this bounds cross-worker drift
+ROSTER_CACHE_TTL = int(os.getenv('ROSTER_CACHE_TTL', '300'))
+
+# Most matches shown for a student or teacher search (core.search)
+SEARCH_RESULTS_LIMIT = int(os.getenv('SEARCH_RESULTS_LIMIT', '50'))
+
+# Optional read replica: a local SQLite copy refreshed with
+# `manage.py refresh_replica`. Read-only requests read core models from it.
+DB_REPLICA_PATH = os.getenv('DB_REPLICA_PATH')
+if DB_REPLICA_PATH:
+    DATABASES['replica'] = {
+        **DATABASES['default'],
+        'NAME': DB_REPLICA_PATH,
+        'TEST': {'MIRROR': 'default'},
+    }
+DATABASE_ROUTERS = ['core.routers.PrimaryReplicaRouter']
+# Seconds a session reads from the primary after it writes
+REPLICA_PIN_SECONDS = int(os.getenv('REPLICA_PIN_SECONDS', '30'))
+
+# Password hashing (core.hashers): PASSWORD_HASHER picks the algorithm for
+# new hashes, the others still verify. Stored hashes are upgraded to the
+# current algorithm and cost on the next successful login. 'argon2' needs
+# the argon2-cffi package.
+PASSWORD_HASHERS = [
+    'core.hashers.ConfigurablePBKDF2PasswordHasher',
+    'core.hashers.ConfigurableArgon2PasswordHasher',
+    'core.hashers.ConfigurableScryptPasswordHasher',
+]
+_preferred_hasher = ['pbkdf2', 'argon2', 'scrypt'].index(os.getenv('PASSWORD_HASHER', 'pbkdf2'))
+PASSWORD_HASHERS.insert(0, PASSWORD_HASHERS.pop(_preferred_hasher))
+PASSWORD_PBKDF2_ITERATIONS = int(os.getenv('PASSWORD_PBKDF2_ITERATIONS', '0')) or None
+PASSWORD_ARGON2_TIME_COST = int(os.getenv('PASSWORD_ARGON2_TIME_COST', '0')) or None
+PASSWORD_ARGON2_MEMORY_COST = int(os.getenv('PASSWORD_ARGON2_MEMORY_COST', '0')) or None
+PASSWORD_SCRYPT_WORK_FACTOR = int(os.getenv('PASSWORD_SCRYPT_WORK_FACTOR', '0')) or None
+
+# Password hashing processes for an upload on the admin import page. 1
+# hashes inside the request's own worker; a pool per request would multiply
+# processes across gunicorn workers. manage.py bulk_import uses every CPU.
+BULK_IMPORT_WEB_WORKERS = int(os.getenv('BULK_IMPORT_WEB_WORKERS', '1'))
+
+# Seconds an unknown login username is remembered per process, rejecting
+# repeats without a query (0 disables). An account created in another
+# worker can be refused for up to this long.
+LOGIN_NEGATIVE_CACHE_TTL = int(os.getenv('LOGIN_NEGATIVE_CACHE_TTL', '0'))
+LOGIN_NEGATIVE_CACHE_SIZE = int(os.getenv('LOGIN_NEGATIVE_CACHE_SIZE', '10000'))
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
@@ -107,6 +241,30 @@ MEDIA_ROOT = BASE_DIR / 'media'
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
+# Request instrumentation (core.middleware.QueryMetricsMiddleware)
+QUERY_METRICS_BUFFER_SIZE = int(os.getenv('QUERY_METRICS_BUFFER_SIZE', '1000'))
+QUERY_BUDGET_DEFAULT = int(os.getenv('QUERY_BUDGET_DEFAULT', '25'))
+QUERY_BUDGETS = {
+    'admin_dashboard': 10,
+    'student_list': 10,
+    'teacher_list': 10,
+    'fees_list': 10,
+    'salary_list': 10,
+    'subject_list': 10,
+    'student_detail': 10,
+    'teacher_detail': 10,
+    'student_attendance_list': 10,
+    'teacher_attendance_list': 10,
+    'student_attendance_mark': 10,
+    'teacher_mark_student_attendance': 10,
+    'teacher_attendance_mark': 10,
+}
+# Raise instead of logging when a view goes over budget (use in tests)
+QUERY_BUDGET_STRICT = os.getenv('QUERY_BUDGET_STRICT', 'False') == 'True'
+
+# List views: 'cursor' for keyset pagination, 'offset' for numbered pages
+LIST_PAGINATION = os.getenv('LIST_PAGINATION', 'cursor')
+
 LOGIN_URL = '/login/'
 LOGIN_REDIRECT_URL = '/'
 LOGOUT_REDIRECT_URL = '/'
@@ -6,3 +6,8 @@ from django.core.wsgi import get_wsgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'school_management.settings')
 application = get_wsgi_application()
+
+# Compile every template now, so workers forked after --preload share them
+from core.template_cache import warm_template_cache  # noqa: E402
+
+warm_template_cache()
@@ -7,6 +7,7 @@ document.addEventListener('DOMContentLoaded', function () {
     initFormValidation();
     initDeleteConfirmation();
     initAttendanceButtons();
+    initAutocomplete();
 });
 
 // Dropdown functionality
@@ -132,6 +133,95 @@ function initAttendanceButtons() {
     });
 }
 
+// Autocomplete selects (core.autocomplete.AutocompleteSelect)
+function initAutocomplete() {
+    const selects = document.querySelectorAll('select[data-autocomplete]');
+
+    selects.forEach(select => {
+        const wrapper = document.createElement('div');
+        const input = document.createElement('input');
+        const menu = document.createElement('div');
+        const selected = select.options[select.selectedIndex];
+        let timer = null;
+        let next = null;
+        let request = 0;
+
+        wrapper.className = 'autocomplete';
+        menu.className = 'autocomplete-menu';
+        input.type = 'search';
+        input.className = select.className;
+        input.placeholder = 'Type to search...';
+        input.autocomplete = 'off';
+        input.value = selected && selected.value ? selected.text : '';
+        input.required = select.required;
+        select.required = false;
+        select.hidden = true;
+        select.parentNode.insertBefore(wrapper, select);
+        wrapper.append(input, menu, select);
+
+        function load(cursor) {
+            const id = ++request;
+            const params = new URLSearchParams({ q: select.value ? '' : input.value.trim() });
+            if (cursor) {
+                params.set('cursor', cursor);
+            }
+            fetch(`${select.dataset.autocomplete}?${params}`)
+                .then(response => response.json())
+                .then(data => {
+                    if (id !== request) return;
+                    if (!cursor) {
+                        menu.innerHTML = '';
+                    }
+                    data.results.forEach(result => {
+                        const item = document.createElement('div');
+                        item.className = 'autocomplete-item';
+                        item.dataset.value = result.id;
+                        item.textContent = result.text;
+                        menu.appendChild(item);
+                    });
+                    if (!menu.children.length) {
+                        menu.innerHTML = '<div class="autocomplete-empty">No matches</div>';
+                    }
+                    next = data.next;
+                    menu.classList.add('active');
+                });
+        }
+
+        input.addEventListener('focus', () => load(null));
+        input.addEventListener('blur', () => menu.classList.remove('active'));
+
+        input.addEventListener('input', () => {
+            select.value = '';
+            clearTimeout(timer);
+            timer = setTimeout(() => load(null), 250);
+        });
+
+        // Fetch the next page when the list is scrolled to its end
+        menu.addEventListener('scroll', () => {
+            if (next && menu.scrollTop + menu.clientHeight >= menu.scrollHeight - 20) {
+                const cursor = next;
+                next = null;
+                load(cursor);
+            }
+        });
+
+        menu.addEventListener('mousedown', e => {
+            const item = e.target.closest('.autocomplete-item');
+            if (!item) return;
+            e.preventDefault();
+            let option = Array.from(select.options).find(o => o.value === item.dataset.value);
+            if (!option) {
+                option = new Option(item.textContent, item.dataset.value);
+                select.add(option);
+            }
+            select.value = item.dataset.value;
+            input.value = item.textContent;
+            menu.classList.remove('active');
+            select.dispatchEvent(new Event('change'));
+        });
+    });
+}
+
 // Mobile menu toggle
 function toggleMobileMenu() {
     const sidebar = document.querySelector('.sidebar');